@@ -8,6 +8,7 @@ Excel导出工具
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
 from openpyxl.utils import get_column_letter
+from openpyxl.cell import WriteOnlyCell
 from datetime import datetime
 import os
 from typing import List, Dict, Any, Optional
@@ -107,10 +108,9 @@ class ExcelExporter:
             导出是否成功
         """
         try:
-            # 创建工作簿
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "批量识别结果"
+            # 使用只写模式创建工作簿，行数据直接写入文件，不在内存中保留单元格对象
+            wb = openpyxl.Workbook(write_only=True)
+            ws = wb.create_sheet("批量识别结果")
 
             # 获取动态字段列表
             dynamic_fields = self._get_dynamic_fields(invoices_data, field_config)
@@ -119,58 +119,64 @@ class ExcelExporter:
             base_headers = ["序号", "图片路径", "处理时间", "解析方式", "AI置信度"]
             field_headers = [field_name for field_name in dynamic_fields]
             headers = base_headers + field_headers + ["识别状态"]
+            status_col = len(headers)
+
+            # 只写模式下列宽必须在写入第一行之前设置
+            self._set_dynamic_column_widths(ws, len(base_headers), len(field_headers))
 
             # 设置表头
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
+            header_row = []
+            for header in headers:
+                cell = WriteOnlyCell(ws, value=header)
                 cell.font = self.header_font
                 cell.fill = self.header_fill
                 cell.border = self.default_border
                 cell.alignment = self.center_alignment
+                header_row.append(cell)
+            ws.append(header_row)
 
             # 填充数据
-            for row, invoice in enumerate(invoices_data, 2):
-                # 基础信息
-                ws.cell(row=row, column=1, value=row-1)  # 序号
-                ws.cell(row=row, column=2, value=invoice.get('图片路径', ''))
-                ws.cell(row=row, column=3, value=invoice.get('处理时间', ''))
-                ws.cell(row=row, column=4, value=invoice.get('解析方式', ''))
-                ws.cell(row=row, column=5, value=invoice.get('AI置信度', ''))
-
-                # 动态填充字段数据
+            for index, invoice in enumerate(invoices_data, 1):
                 fields = invoice.get('提取字段', {})
-                for col, field_name in enumerate(dynamic_fields, 6):
-                    field_value = fields.get(field_name, '')
-                    ws.cell(row=row, column=col, value=field_value)
 
                 # 识别状态
-                extracted_count = len([v for v in fields.values() if v])
+                extracted_count = sum(1 for v in fields.values() if v)
                 total_fields = len(fields)
-                status = f"{extracted_count}/{total_fields}"
-                status_col = len(headers)
-                ws.cell(row=row, column=status_col, value=status)
+                if extracted_count == total_fields:
+                    status_fill = self.success_fill
+                elif extracted_count >= total_fields * 0.7:
+                    status_fill = self.warning_fill
+                else:
+                    status_fill = self.error_fill
+
+                # 基础信息 + 动态字段数据 + 识别状态
+                values = [
+                    index,  # 序号
+                    invoice.get('图片路径', ''),
+                    invoice.get('处理时间', ''),
+                    invoice.get('解析方式', ''),
+                    invoice.get('AI置信度', ''),
+                ]
+                values.extend(fields.get(field_name, '') for field_name in dynamic_fields)
+                values.append(f"{extracted_count}/{total_fields}")
 
                 # 设置行样式
-                for col in range(1, status_col + 1):
-                    cell = ws.cell(row=row, column=col)
-                    cell.font = self.content_font
+                row_cells = []
+                for col, value in enumerate(values, 1):
+                    cell = WriteOnlyCell(ws, value=value)
                     cell.border = self.default_border
-                    cell.alignment = self.left_alignment
-
-                    # 根据识别状态设置背景色
-                    if col == status_col:  # 状态列
-                        if extracted_count == total_fields:
-                            cell.fill = self.success_fill
-                        elif extracted_count >= total_fields * 0.7:
-                            cell.fill = self.warning_fill
-                        else:
-                            cell.fill = self.error_fill
-                    elif col >= 6 and col < status_col:  # 字段数据列
+                    if col == status_col:  # 状态列，根据识别状态设置背景色
+                        cell.font = self.content_font
+                        cell.alignment = self.left_alignment
+                        cell.fill = status_fill
+                    elif col >= 6:  # 字段数据列
                         cell.font = self.number_font
                         cell.alignment = self.right_alignment
-
-            # 动态设置列宽
-            self._set_dynamic_column_widths(ws, len(base_headers), len(field_headers))
+                    else:
+                        cell.font = self.content_font
+                        cell.alignment = self.left_alignment
+                    row_cells.append(cell)
+                ws.append(row_cells)
 
             # 保存文件
             wb.save(file_path)
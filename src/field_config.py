@@ -7,11 +7,22 @@
 
 import json
 import os
+import re
 import logging
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
+# 字段值校验用的正则表达式，模块加载时预编译
+# 日期：(年, 月, 日) 格式在前，最后一个为 MM/DD/YYYY
+DATE_VALUE_PATTERNS = (
+    re.compile(r'(\d{4})[-/年](\d{1,2})[-/月](\d{1,2})日?'),
+    re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})'),
+)
+US_DATE_VALUE_PATTERN = re.compile(r'(\d{1,2})[/](\d{1,2})[/](\d{4})')
+AMOUNT_VALUE_PATTERN = re.compile(r'(\d+(?:,\d{3})*(?:\.\d{2})?)')
+NUMBER_VALUE_PATTERN = re.compile(r'\d+')
+
 
 @dataclass
 class FieldDefinition:
@@ -38,6 +49,9 @@ class FieldConfigManager:
         self.config_path = config_path
         self.fields: Dict[str, FieldDefinition] = {}
 
+        # 已编译的字段模式：字段名 -> (模式字符串元组, 编译结果元组)
+        self._compiled_patterns: Dict[str, tuple] = {}
+
         # 加载配置
         self.load_config()
 
@@ -106,10 +120,10 @@ class FieldConfigManager:
                 description="价税合计总金额",
                 field_type="amount",
                 patterns=[
-                    r'价税合计[:：]\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-                    r'合计金额[:：]\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-                    r'Total[:：]\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-                    r'金额[:：]\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)'
+                    r'价税合计[:：]\s*(?:￥\s*)?(\d+(?:,\d{3})*(?:\.\d{2})?)',
+                    r'合计金额[:：]\s*(?:￥\s*)?(\d+(?:,\d{3})*(?:\.\d{2})?)',
+                    r'Total[:：]\s*(?:￥\s*)?(\d+(?:,\d{3})*(?:\.\d{2})?)',
+                    r'金额[:：]\s*(?:￥\s*)?(\d+(?:,\d{3})*(?:\.\d{2})?)'
                 ],
                 ai_prompt="提取价税合计或总金额，只返回数字",
                 required=True
@@ -119,9 +133,9 @@ class FieldConfigManager:
                 description="增值税税额",
                 field_type="amount",
                 patterns=[
-                    r'税额[:：]\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-                    r'增值税[:：]\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-                    r'Tax[:：]\s*￥?\s*(\d+(?:,\d{3}*(?:\.\d{2})?)'
+                    r'税额[:：]\s*(?:￥\s*)?(\d+(?:,\d{3})*(?:\.\d{2})?)',
+                    r'增值税[:：]\s*(?:￥\s*)?(\d+(?:,\d{3})*(?:\.\d{2})?)',
+                    r'Tax[:：]\s*(?:￥\s*)?(\d+(?:,\d{3})*(?:\.\d{2})?)'
                 ],
                 ai_prompt="提取增值税税额，只返回数字",
                 required=False
@@ -144,9 +158,11 @@ class FieldConfigManager:
             with open(self.config_path, 'r', encoding='utf-8') as f:
                 config_data = json.load(f)
 
-            # 解析字段定义
+            # 解析字段定义，全部解析成功后再替换，重新加载时已删除的字段不会残留
+            fields = {}
             for field_name, field_data in config_data.get('fields', {}).items():
-                self.fields[field_name] = FieldDefinition(**field_data)
+                fields[field_name] = FieldDefinition(**field_data)
+            self.fields = fields
 
             self.logger.info(f"从配置文件加载了 {len(self.fields)} 个字段配置")
 
@@ -212,6 +228,33 @@ class FieldConfigManager:
         """获取所有字段定义"""
         return self.fields.copy()
 
+    def compiled_patterns_for(self, field_name: str) -> tuple:
+        """
+        获取字段已编译的提取模式（忽略大小写）
+
+        编译结果按字段缓存，字段的模式列表变化后自动重新编译；
+        有误的正则表达式只在编译时记录一次警告，并从结果中跳过
+        """
+        field = self.fields.get(field_name)
+        if not field or not field.patterns:
+            return ()
+
+        patterns = tuple(field.patterns)
+        cached = self._compiled_patterns.get(field_name)
+        if cached is not None and cached[0] == patterns:
+            return cached[1]
+
+        compiled = []
+        for pattern in patterns:
+            try:
+                compiled.append(re.compile(pattern, re.IGNORECASE))
+            except re.error as e:
+                self.logger.warning(f"字段 {field_name} 的正则表达式有误: {pattern}, 错误: {e}")
+
+        compiled = tuple(compiled)
+        self._compiled_patterns[field_name] = (patterns, compiled)
+        return compiled
+
     def create_ai_prompt(self, fields: List[str]) -> str:
         """根据字段配置创建AI提示词"""
         if not fields:
@@ -269,32 +312,24 @@ OCR识别文本：
             # 根据字段类型验证
             if field.field_type == "date":
                 # 日期格式验证和标准化
-                import re
-                date_patterns = [
-                    r'(\d{4})[-/年](\d{1,2})[-/月](\d{1,2})日?',
-                    r'(\d{4})-(\d{1,2})-(\d{1,2})',
-                    r'(\d{1,2})[/](\d{1,2})[/](\d{4})',
-                ]
-
-                for pattern in date_patterns:
-                    match = re.search(pattern, value)
+                for pattern in DATE_VALUE_PATTERNS:
+                    match = pattern.search(value)
                     if match:
-                        if pattern == date_patterns[2]:  # MM/DD/YYYY
-                            return f"{match.group(3)}-{match.group(1):0>2}-{match.group(2):0>2}"
-                        else:
-                            return f"{match.group(1)}-{match.group(2):0>2}-{match.group(3):0>2}"
+                        return f"{match.group(1)}-{match.group(2):0>2}-{match.group(3):0>2}"
+
+                match = US_DATE_VALUE_PATTERN.search(value)
+                if match:  # MM/DD/YYYY
+                    return f"{match.group(3)}-{match.group(1):0>2}-{match.group(2):0>2}"
 
             elif field.field_type == "amount":
                 # 金额格式处理
-                import re
-                amount_match = re.search(r'(\d+(?:,\d{3})*(?:\.\d{2})?)', value.replace(',', ''))
+                amount_match = AMOUNT_VALUE_PATTERN.search(value.replace(',', ''))
                 if amount_match:
                     return amount_match.group(1)
 
             elif field.field_type == "number":
                 # 数字格式处理
-                import re
-                number_match = re.search(r'\d+', value.replace(',', ''))
+                number_match = NUMBER_VALUE_PATTERN.search(value.replace(',', ''))
                 if number_match:
                     return number_match.group()
 
@@ -9,13 +9,21 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
 import os
+import sys
+import time
 import json
+import csv
+import subprocess
+import webbrowser
 import logging
 from datetime import datetime
 from PIL import Image, ImageTk
 import io
 import base64
-from invoice_ocr_tool import InvoiceOCRTool
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from invoice_ocr_tool import InvoiceOCRTool, PDFIUM_LOCK
 from excel_exporter import ExcelExporter
 
 # 导入字段配置管理器
@@ -25,10 +33,103 @@ try:
 except ImportError:
     FIELD_CONFIG_AVAILABLE = False
 
+# 可选：orjson序列化大体积OCR结果更快，未安装时使用标准库json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 预览区域尺寸
+PREVIEW_SIZE = (350, 450)
+
+# 预览图缓存容量（识别结果由InvoiceOCRTool按文件内容缓存）
+PREVIEW_CACHE_SIZE = 32
+
+# 原始结果文本框每次插入的字符数
+TEXT_INSERT_CHUNK_SIZE = 64 * 1024
+
+# 启动OCR服务后等待其就绪的最长时间（秒）
+OCR_READY_TIMEOUT = 10.0
+
+# 批量处理时默认同时提交给OCR服务的文件数
+BATCH_MAX_WORKERS = 4
+
+# 批量处理支持的文件扩展名（元组，可直接传给str.endswith）
+BATCH_FILE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.pdf')
+
+# 批量处理界面刷新的最小间隔（秒）
+BATCH_UI_UPDATE_INTERVAL = 0.1
+
+# 选择发票文件对话框的文件类型
+OPEN_FILE_TYPES = (
+    ('支持的文件', '*.jpg *.jpeg *.png *.bmp *.tiff *.pdf'),
+    ('PDF文件', '*.pdf'),
+    ('图片文件', '*.jpg *.jpeg *.png *.bmp *.tiff'),
+    ('JPEG文件', '*.jpg *.jpeg'),
+    ('PNG文件', '*.png'),
+    ('所有文件', '*.*'),
+)
+
+# 导出识别结果对话框的文件类型
+SAVE_FILE_TYPES_EXCEL = (
+    ('Excel文件', '*.xlsx'),
+    ('所有文件', '*.*'),
+)
+
+# 导出批量处理结果对话框的文件类型
+SAVE_FILE_TYPES_BATCH = (
+    ('Excel文件', '*.xlsx'),
+    ('JSON文件', '*.json'),
+    ('CSV文件', '*.csv'),
+)
+
+# 字段表格的列 (列名, 标题, 宽度, 最小宽度)
+FIELD_TREE_COLUMNS = (
+    ('字段名称', '🏷️ 字段名称', 150, 100),
+    ('提取内容', '📝 提取内容', 300, 200),
+    ('状态', '✅ 状态', 100, 80),
+)
+
+# 字段表格的行标签颜色 (标签, 背景色)
+FIELD_TREE_TAGS = (
+    ('required', '#fff8e1'),  # 必需字段浅黄色背景
+    ('optional', '#f1f8e9'),  # 可选字段浅绿色背景
+    ('success', '#d4edda'),
+    ('warning', '#fff3cd'),
+    ('error', '#f8d7da'),
+)
+
+# 界面样式 (样式名, 配置项)
+UI_STYLES = (
+    # 自定义颜色
+    ('Title.TLabel', {'font': ('微软雅黑', 18, 'bold'), 'foreground': '#2c3e50'}),
+    ('Header.TLabel', {'font': ('微软雅黑', 12, 'bold')}),
+    ('Success.TLabel', {'foreground': '#27ae60'}),
+    ('Error.TLabel', {'foreground': '#e74c3c'}),
+    ('Warning.TLabel', {'foreground': '#f39c12'}),
+    ('Info.TLabel', {'foreground': '#3498db'}),
+    ('Status.TLabel', {'font': ('微软雅黑', 10)}),
+    # 按钮样式
+    ('Primary.TButton', {'font': ('微软雅黑', 10, 'bold')}),
+)
+
 
 class InvoiceOCRGUI:
     """发票OCR识别工具优化GUI界面"""
 
+    # 识别结果展示用的固定映射与文案，避免每次显示结果时重复构造
+    _FIELD_STATUS_MAP = {
+        '发票号码': '✅',
+        '开票日期': '✅',
+        '销售方名称': '✅',
+        '购买方名称': '✅',
+        '合计金额': '✅',
+        '税额': '✅'
+    }
+    _METHOD_AI = "🤖 AI智能解析"
+    _METHOD_REGEX = "📝 传统正则解析"
+
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("发票OCR识别工具 - 老王特供")
@@ -66,10 +167,23 @@ class InvoiceOCRGUI:
 
         # 当前图片路径和数据
         self.current_image_path = None
+        self.current_image_bytes = None  # 选择文件时读取一次，预览和识别共用
         self.current_result = None
         self.ai_confidence = None
         self.parsing_method = None
 
+        # 预览图缓存，重复选择同一文件时跳过渲染
+        self._preview_cache = OrderedDict()
+
+        # 原始结果文本的版本号，清除结果时递增以中止未完成的分块插入
+        self._raw_text_generation = 0
+
+        # 预览用的PhotoImage，首次显示时创建后重复使用
+        self._preview_photo = None
+
+        # 配置的字段总数，仅在加载/刷新字段列表时重新统计
+        self._total_fields = self._count_total_fields()
+
         # 创建界面
         self.create_widgets()
 
@@ -79,20 +193,11 @@ class InvoiceOCRGUI:
     def setup_styles(self):
         """设置界面样式"""
         try:
-            style = ttk.Style()
+            style = ttk.Style(self.root)
             style.theme_use('clam')
 
-            # 自定义颜色
-            style.configure('Title.TLabel', font=('微软雅黑', 18, 'bold'), foreground='#2c3e50')
-            style.configure('Header.TLabel', font=('微软雅黑', 12, 'bold'))
-            style.configure('Success.TLabel', foreground='#27ae60')
-            style.configure('Error.TLabel', foreground='#e74c3c')
-            style.configure('Warning.TLabel', foreground='#f39c12')
-            style.configure('Info.TLabel', foreground='#3498db')
-            style.configure('Status.TLabel', font=('微软雅黑', 10))
-
-            # 按钮样式
-            style.configure('Primary.TButton', font=('微软雅黑', 10, 'bold'))
+            for style_name, options in UI_STYLES:
+                style.configure(style_name, **options)
 
         except Exception:
             # 如果样式设置失败，使用默认样式
@@ -269,22 +374,17 @@ class InvoiceOCRGUI:
         table_container.pack(fill='both', expand=True)
 
         # 创建Treeview表格
-        columns = ('字段名称', '提取内容', '状态')
+        columns = tuple(column for column, _, _, _ in FIELD_TREE_COLUMNS)
         self.fields_tree = ttk.Treeview(table_container, columns=columns, show='headings', height=12)
 
-        # 设置列标题和属性
-        self.fields_tree.heading('字段名称', text='🏷️ 字段名称')
-        self.fields_tree.heading('提取内容', text='📝 提取内容')
-        self.fields_tree.heading('状态', text='✅ 状态')
+        # 设置列标题和列宽
+        for column, heading, width, minwidth in FIELD_TREE_COLUMNS:
+            self.fields_tree.heading(column, text=heading)
+            self.fields_tree.column(column, width=width, minwidth=minwidth)
 
-        # 设置列宽
-        self.fields_tree.column('字段名称', width=150, minwidth=100)
-        self.fields_tree.column('提取内容', width=300, minwidth=200)
-        self.fields_tree.column('状态', width=100, minwidth=80)
-
-        # 设置样式
-        self.fields_tree.tag_configure('required', background='#fff8e1')  # 必需字段浅黄色背景
-        self.fields_tree.tag_configure('optional', background='#f1f8e9')   # 可选字段浅绿色背景
+        # 配置行颜色（在加载字段列表之前统一设置）
+        for tag, background in FIELD_TREE_TAGS:
+            self.fields_tree.tag_configure(tag, background=background)
 
         # 添加滚动条
         scrollbar_v = ttk.Scrollbar(table_container, orient="vertical", command=self.fields_tree.yview)
@@ -302,11 +402,6 @@ class InvoiceOCRGUI:
         # 初始化显示字段列表
         self.load_fields_list()
 
-        # 配置行颜色
-        self.fields_tree.tag_configure('success', background='#d4edda')
-        self.fields_tree.tag_configure('warning', background='#fff3cd')
-        self.fields_tree.tag_configure('error', background='#f8d7da')
-
     def create_raw_display(self):
         """创建原始结果显示区域"""
         raw_container = ttk.Frame(self.raw_frame, padding="10")
@@ -389,104 +484,89 @@ class InvoiceOCRGUI:
 
     def select_image(self):
         """选择发票文件"""
-        file_types = [
-            ('支持的文件', '*.jpg *.jpeg *.png *.bmp *.tiff *.pdf'),
-            ('PDF文件', '*.pdf'),
-            ('图片文件', '*.jpg *.jpeg *.png *.bmp *.tiff'),
-            ('JPEG文件', '*.jpg *.jpeg'),
-            ('PNG文件', '*.png'),
-            ('所有文件', '*.*')
-        ]
-
         file_path = filedialog.askopenfilename(
             title="选择发票文件",
-            filetypes=file_types
+            filetypes=OPEN_FILE_TYPES
         )
 
         if file_path:
             self.current_image_path = file_path
+            try:
+                with open(file_path, 'rb') as f:
+                    self.current_image_bytes = f.read()
+            except Exception as e:
+                self.logger.error(f"文件读取失败: {e}")
+                self.current_image_bytes = None
             filename = os.path.basename(file_path)
             self.image_path_var.set(f"📄 {filename}")
             self.display_image_preview(file_path)
 
+    @staticmethod
+    def _file_cache_key(file_path):
+        """生成文件缓存键 (路径, 修改时间, 大小)"""
+        stat = os.stat(file_path)
+        return (file_path, stat.st_mtime, stat.st_size)
+
+    @staticmethod
+    def _cache_put(cache, key, value, max_size):
+        """写入LRU缓存，超出容量时淘汰最旧的条目"""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+
     def display_image_preview(self, image_path):
-        """显示图片或PDF预览"""
+        """显示图片或PDF预览（缓存未命中时在后台线程渲染，完成后回到主线程显示）"""
         try:
-            # 检查是否为PDF文件
-            if image_path.lower().endswith('.pdf'):
-                self.logger.info(f"显示PDF预览: {image_path}")
+            cache_key = self._file_cache_key(image_path)
+        except Exception as e:
+            self._show_preview_error(f"❌ 预览失败\n{str(e)}")
+            return
 
-                # 检查pypdfium2是否可用
-                try:
-                    import pypdfium2 as pdfium
-                except ImportError:
-                    self.image_preview_label.configure(
-                        image='',
-                        text="❌ PDF预览失败\npypdfium2库未安装\n请运行: pip install pypdfium2",
-                        background='#ffe0e0'
-                    )
-                    return
+        image = self._preview_cache.get(cache_key)
+        if image is not None:
+            self._preview_cache.move_to_end(cache_key)
+            self._show_preview(image_path, image)
+            return
 
-                # 打开PDF文件
-                pdf = None
-                page = None
-                bitmap = None
+        self.image_preview_label.configure(image='', text="⏳ 正在加载预览...", background='#f0f0f0')
 
-                try:
-                    pdf = pdfium.PdfDocument(image_path)
-                    self.logger.info(f"PDF预览打开成功，共 {len(pdf)} 页")
-
-                    # 处理第一页
-                    page = pdf[0]
-
-                    # 渲染页面为图片（预览用较低分辨率）
-                    bitmap = page.render(
-                        scale=0.8,  # 适合预览的分辨率
-                    )
-
-                    # 将渲染的位图转换为PIL Image
-                    image = bitmap.to_pil()
-
-                except Exception as pdf_error:
-                    self.image_preview_label.configure(
-                        image='',
-                        text=f"❌ PDF预览失败\n{str(pdf_error)}\n请检查PDF文件是否损坏",
-                        background='#ffe0e0'
-                    )
-                    return
-                finally:
-                    # 清理PDF资源
-                    if bitmap:
-                        bitmap = None
-                    if page:
-                        page = None
-                    if pdf:
-                        pdf.close()
-            else:
-                # 加载图片文件
-                try:
-                    image = Image.open(image_path)
-                except Exception as img_error:
-                    self.image_preview_label.configure(
-                        image='',
-                        text=f"❌ 图片预览失败\n{str(img_error)}\n请检查图片文件格式",
-                        background='#ffe0e0'
-                    )
-                    return
+        # 在主线程取好数据源，避免后台线程读取时当前文件已被切换
+        source = self._preview_source(image_path)
 
-            # 调整图片大小以适应预览区域
-            preview_width = 350
-            preview_height = 450
+        def render_preview():
+            image, error_text = self._load_preview_image(image_path, source)
+            if image is not None:
+                image = self._fit_preview_canvas(image)
+            self.root.after(0, lambda: self._on_preview_loaded(image_path, cache_key, image, error_text))
 
-            # 保持宽高比缩放
-            image.thumbnail((preview_width, preview_height), Image.Resampling.LANCZOS)
+        threading.Thread(target=render_preview, daemon=True).start()
 
-            # 转换为PhotoImage
-            photo = ImageTk.PhotoImage(image)
+    def _on_preview_loaded(self, image_path, cache_key, image, error_text):
+        """后台渲染完成后的回调（主线程）"""
+        if image is not None:
+            # 缓存PIL图片（PhotoImage依赖Tk，不能缓存）
+            self._cache_put(self._preview_cache, cache_key, image, PREVIEW_CACHE_SIZE)
+
+        # 渲染期间用户已选择了其他文件，丢弃过期结果
+        if image_path != self.current_image_path:
+            return
+
+        if image is None:
+            self._show_preview_error(error_text)
+        else:
+            self._show_preview(image_path, image)
+
+    def _show_preview(self, image_path, image):
+        """将PIL图片显示到预览区域（必须在主线程调用）"""
+        try:
+            # 复用同一个预览尺寸的PhotoImage，原地更新内容，避免每次新建Tk图片
+            if self._preview_photo is None:
+                self._preview_photo = ImageTk.PhotoImage('RGB', PREVIEW_SIZE)
+            self._preview_photo.paste(image)
 
             # 显示图片
-            self.image_preview_label.configure(image=photo, text="", background='white')
-            self.image_preview_label.image = photo  # 保持引用
+            self.image_preview_label.configure(image=self._preview_photo, text="", background='white')
 
             # 更新状态
             file_type = "PDF" if image_path.lower().endswith('.pdf') else "图片"
@@ -494,37 +574,127 @@ class InvoiceOCRGUI:
 
         except Exception as e:
             self.logger.error(f"预览显示失败: {e}")
-            self.image_preview_label.configure(
-                image='',
-                text=f"❌ 预览失败\n{str(e)}",
-                background='#ffe0e0'
-            )
+            self._show_preview_error(f"❌ 预览失败\n{str(e)}")
+
+    @staticmethod
+    def _fit_preview_canvas(image):
+        """将缩略图居中贴到预览尺寸的白色画布上，使其可直接写入固定尺寸的PhotoImage"""
+        canvas = Image.new('RGB', PREVIEW_SIZE, 'white')
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        offset = ((PREVIEW_SIZE[0] - image.width) // 2, (PREVIEW_SIZE[1] - image.height) // 2)
+        canvas.paste(image, offset)
+        return canvas
+
+    def _show_preview_error(self, error_text):
+        """在预览区域显示错误信息"""
+        self.image_preview_label.configure(
+            image='',
+            text=error_text,
+            background='#ffe0e0'
+        )
+
+    def _preview_source(self, image_path):
+        """优先使用已读取的文件内容，避免重复打开文件"""
+        if image_path == self.current_image_path and self.current_image_bytes is not None:
+            return self.current_image_bytes
+        return image_path
+
+    def _load_preview_image(self, image_path, source):
+        """加载缩放到预览尺寸的PIL图片（不访问Tk，可在后台线程调用）
+
+        Returns:
+            (PIL图片, None) 或失败时 (None, 错误提示文本)
+        """
+        # 检查是否为PDF文件
+        if image_path.lower().endswith('.pdf'):
+            self.logger.info(f"显示PDF预览: {image_path}")
+
+            # 检查pypdfium2是否可用
+            try:
+                import pypdfium2 as pdfium
+            except ImportError:
+                return None, "❌ PDF预览失败\npypdfium2库未安装\n请运行: pip install pypdfium2"
+
+            try:
+                # pdfium不是线程安全的，与识别线程共用同一把锁
+                with PDFIUM_LOCK:
+                    # 上下文管理器保证异常路径上也会关闭文档
+                    with pdfium.PdfDocument(source) as pdf:
+                        self.logger.info(f"PDF预览打开成功，共 {len(pdf)} 页")
+
+                        # 处理第一页
+                        page = pdf[0]
+
+                        # 按预览区域计算缩放比例（scale=1 对应 1像素/点），直接渲染为预览尺寸
+                        width_pt, height_pt = page.get_size()
+                        scale = min(PREVIEW_SIZE[0] / width_pt, PREVIEW_SIZE[1] / height_pt)
+
+                        # 使用RGBX格式，PIL可直接共享位图缓冲区，省去BGR->RGB转换
+                        bitmap = page.render(
+                            scale=scale,
+                            rev_byteorder=True,
+                            prefer_bgrx=True,
+                        )
+
+                        # 转换为独立的RGB图片后即可释放位图和页面
+                        image = bitmap.to_pil().convert('RGB')
+                        bitmap.close()
+                        page.close()
+                        return image, None
+
+            except Exception as pdf_error:
+                self.logger.error(f"PDF预览失败: {pdf_error}")
+                return None, f"❌ PDF预览失败\n{str(pdf_error)}\n请检查PDF文件是否损坏"
+        else:
+            # 加载图片文件
+            try:
+                if isinstance(source, bytes):
+                    source = io.BytesIO(source)
+                image = Image.open(source)
+
+                # JPEG可在解码时直接按1/2、1/4、1/8缩小，大图预览无需完整解码
+                image.draft('RGB', PREVIEW_SIZE)
+
+                # 保持宽高比缩放以适应预览区域（预览尺寸下BILINEAR与LANCZOS肉眼无差别，且快得多）
+                image.thumbnail(PREVIEW_SIZE, Image.Resampling.BILINEAR)
+                return image, None
+            except Exception as img_error:
+                self.logger.error(f"图片预览失败: {img_error}")
+                return None, f"❌ 图片预览失败\n{str(img_error)}\n请检查图片文件格式"
 
     def test_connections_async(self):
-        """异步测试服务连接"""
-        def test_connections():
+        """异步测试服务连接（OCR和AI服务并行检测，各自完成后立即更新状态）"""
+        def report_error(e):
+            error_msg = f"连接测试失败: {str(e)}"
+            self.root.after(0, lambda: self.progress_var.set(f"⚠️ {error_msg}"))
+
+        def test_ocr_connection():
             try:
-                # 测试OCR服务
                 if self.ocr_tool.test_ocr_connection():
                     self.root.after(0, lambda: self.ocr_status_var.set("✅ OCR服务正常"))
                     self.root.after(0, lambda: self.start_ocr_btn.grid_forget())  # 隐藏启动按钮
                 else:
                     self.root.after(0, lambda: self.ocr_status_var.set("❌ OCR服务未运行"))
                     self.root.after(0, lambda: self.start_ocr_btn.grid(row=0, column=1, padx=(10, 0), sticky=tk.E))  # 显示启动按钮在右侧
+            except Exception as e:
+                report_error(e)
 
-                # 测试AI服务 (如果启用)
-                if self.ai_enabled and self.ocr_tool.ai_parser:
-                    if self.ocr_tool.ai_parser.test_ai_connection():
-                        self.root.after(0, lambda: self.ai_status_var.set("✅ AI服务正常"))
-                    else:
-                        self.root.after(0, lambda: self.ai_status_var.set("❌ AI服务失败"))
-
+        def test_ai_connection():
+            try:
+                if self.ocr_tool.ai_parser.test_ai_connection():
+                    self.root.after(0, lambda: self.ai_status_var.set("✅ AI服务正常"))
+                else:
+                    self.root.after(0, lambda: self.ai_status_var.set("❌ AI服务失败"))
             except Exception as e:
-                error_msg = f"连接测试失败: {str(e)}"
-                self.root.after(0, lambda: self.progress_var.set(f"⚠️ {error_msg}"))
+                report_error(e)
+
+        # 在后台线程中并行测试连接，AI服务响应慢时不影响OCR状态显示
+        threading.Thread(target=test_ocr_connection, daemon=True).start()
 
-        # 在后台线程中测试连接
-        threading.Thread(target=test_connections, daemon=True).start()
+        # 测试AI服务 (如果启用)
+        if self.ai_enabled and self.ocr_tool.ai_parser:
+            threading.Thread(target=test_ai_connection, daemon=True).start()
 
     def toggle_ai_mode(self):
         """切换AI模式"""
@@ -542,15 +712,16 @@ class InvoiceOCRGUI:
         self.recognize_btn.configure(state='disabled')
         self.progress_var.set("🔄 正在识别中，请稍候...")
         self.progress_bar.start(10)
-        self.root.update()
+        self.root.update_idletasks()
 
         def recognize_image():
             try:
                 # 确定文件类型
                 file_type = "PDF" if self.current_image_path.lower().endswith('.pdf') else "图片"
 
-                # 执行OCR识别
-                result = self.ocr_tool.process_invoice(self.current_image_path)
+                # 执行OCR识别（相同文件内容的OCR和解析结果由识别工具缓存）
+                result = self.ocr_tool.process_invoice(self.current_image_path,
+                                                       image_data=self.current_image_bytes)
 
                 if result:
                     # 在主线程中更新界面
@@ -599,7 +770,7 @@ class InvoiceOCRGUI:
 
         # 更新解析信息
         if self.ai_enabled:
-            method_text = "🤖 AI智能解析" if 'AI' in parsing_method else "📝 传统正则解析"
+            method_text = self._METHOD_AI if 'AI' in parsing_method else self._METHOD_REGEX
             self.method_var.set(method_text)
 
             if ai_confidence is not None:
@@ -607,35 +778,26 @@ class InvoiceOCRGUI:
             else:
                 self.confidence_var.set("")
         else:
-            self.method_var.set("📝 传统正则解析")
+            self.method_var.set(self._METHOD_REGEX)
             self.confidence_var.set("")
 
         # 显示提取的字段
-        field_status_map = {
-            '发票号码': '✅',
-            '开票日期': '✅',
-            '销售方名称': '✅',
-            '购买方名称': '✅',
-            '合计金额': '✅',
-            '税额': '✅'
-        }
-
-        for field_name, field_value in extracted_fields.items():
-            if field_value:
-                status = field_status_map.get(field_name, '✅')
-                tag = 'success'
-            else:
-                status = '❌'
-                tag = 'error'
-
-            item = self.fields_tree.insert('', 'end', values=(field_name, field_value or "未识别", status))
-            if tag:
-                self.fields_tree.item(item, tags=(tag,))
+        field_status_map = self._FIELD_STATUS_MAP
+        # 先组装好所有行，再一次性插入，标签随insert一并设置，最后统一刷新布局
+        rows = [
+            ((field_name, field_value, field_status_map.get(field_name, '✅')), 'success')
+            if field_value else
+            ((field_name, "未识别", '❌'), 'error')
+            for field_name, field_value in extracted_fields.items()
+        ]
+        for values, tag in rows:
+            self.fields_tree.insert('', 'end', values=values, tags=(tag,))
+        self.fields_tree.update_idletasks()
 
-        # 显示原始OCR结果
+        # 显示原始OCR结果（分块插入，避免大段JSON一次性插入卡住界面）
         if 'OCR原始结果' in result and result['OCR原始结果']:
             raw_json = json.dumps(result['OCR原始结果'], ensure_ascii=False, indent=2)
-            self.raw_text.insert(tk.END, raw_json)
+            self._insert_raw_text_chunked(raw_json, self._raw_text_generation)
 
         # 显示AI分析结果 (仅AI版本)
         if self.ai_enabled and hasattr(result, 'ai_analysis') and result.ai_analysis:
@@ -646,17 +808,23 @@ class InvoiceOCRGUI:
             self.ai_text.insert(tk.END, ai_text)
 
         # 更新状态
-        extracted_count = len([v for v in extracted_fields.values() if v])
-        # 获取当前配置的字段总数
-        if FIELD_CONFIG_AVAILABLE:
-            total_fields = len(field_config_manager.get_field_names())
-        else:
-            total_fields = 6
-        self.progress_var.set(f"✅ 识别完成！成功提取 {extracted_count}/{total_fields} 个字段")
+        extracted_count = sum(1 for v in extracted_fields.values() if v)
+        self.progress_var.set(f"✅ 识别完成！成功提取 {extracted_count}/{self._total_fields} 个字段")
 
         # 显示成功消息
         messagebox.showinfo("成功", f"发票识别完成！\n成功提取 {extracted_count} 个字段")
 
+    def _insert_raw_text_chunked(self, text, generation, offset=0):
+        """分块向原始结果文本框插入内容，每块之间让出事件循环"""
+        # 结果已被清除或替换，停止插入
+        if generation != self._raw_text_generation:
+            return
+
+        self.raw_text.insert(tk.END, text[offset:offset + TEXT_INSERT_CHUNK_SIZE])
+        offset += TEXT_INSERT_CHUNK_SIZE
+        if offset < len(text):
+            self.root.after(0, self._insert_raw_text_chunked, text, generation, offset)
+
     def show_error(self, error_msg):
         """显示错误信息"""
         self.progress_var.set("❌ 识别失败")
@@ -664,11 +832,11 @@ class InvoiceOCRGUI:
 
     def clear_results(self):
         """清除结果"""
-        # 清除字段表格
-        for item in self.fields_tree.get_children():
-            self.fields_tree.delete(item)
+        # 清除字段表格（一次调用删除全部行）
+        self.fields_tree.delete(*self.fields_tree.get_children())
 
-        # 清除原始结果文本
+        # 清除原始结果文本，并丢弃尚未插入完的分块
+        self._raw_text_generation += 1
         self.raw_text.delete(1.0, tk.END)
 
         # 清除AI结果文本
@@ -682,14 +850,10 @@ class InvoiceOCRGUI:
   
     def start_ocr_service(self):
         """启动OCR服务"""
-        import subprocess
-        import os
-        import sys
-
         try:
             # 导入OCR服务检测器
             try:
-                from ocr_service_detector import ocr_detector
+                from ocr_service_detector import ocr_detector, find_ocr_entry
 
                 # 首先检查OCR服务是否已经运行
                 if ocr_detector.is_ocr_service_running():
@@ -712,14 +876,18 @@ class InvoiceOCRGUI:
                     exe_file = os.path.join(ocr_service_path, "Umi-OCR.exe")
                     if ocr_detector.is_process_running(exe_file):
                         self.logger.info(f"OCR服务进程已在运行: {ocr_service_path}")
-                        # 等待服务启动完成
-                        import time
-                        for i in range(10):  # 最多等待10秒
-                            if ocr_detector.is_ocr_service_running():
-                                self.ocr_status_var.set("✅ OCR服务已连接")
-                                self.start_ocr_btn.pack_forget()
-                                return
-                            time.sleep(1)
+                        # 在后台线程中等待服务启动完成，超时则重新启动服务
+                        self.ocr_status_var.set("⏳ 等待OCR服务就绪...")
+                        self.start_ocr_btn.config(state="disabled")
+
+                        def wait_for_running_service():
+                            if self._wait_for_ocr_ready():
+                                self.root.after(0, self._apply_ocr_status, True)
+                            else:
+                                self.root.after(0, self._start_ocr_service_with_path, ocr_service_path)
+
+                        threading.Thread(target=wait_for_running_service, daemon=True).start()
+                        return
 
                     self.logger.info(f"自动检测到OCR服务: {ocr_service_path} ({service_type})")
                 else:
@@ -733,18 +901,18 @@ class InvoiceOCRGUI:
 
                     ocr_service_path = None
                     for path in common_paths:
-                        if os.path.exists(path):
-                            # 检查子目录
-                            for item in os.listdir(path):
-                                item_path = os.path.join(path, item)
-                                if os.path.isdir(item_path):
-                                    exe_file = os.path.join(item_path, "Umi-OCR.exe")
-                                    main_script = os.path.join(item_path, "main.py")
-                                    if os.path.exists(exe_file) or os.path.exists(main_script):
-                                        ocr_service_path = item_path
+                        # 检查子目录（scandir自带文件类型信息，省去逐项的isdir调用）
+                        try:
+                            with os.scandir(path) as entries:
+                                for entry in entries:
+                                    if entry.is_dir() and find_ocr_entry(entry.path):
+                                        ocr_service_path = entry.path
                                         break
-                            if ocr_service_path:
-                                break
+                        except OSError:
+                            # 路径不存在或无法访问
+                            continue
+                        if ocr_service_path:
+                            break
 
                     if not ocr_service_path:
                         self._show_ocr_not_found_dialog()
@@ -759,18 +927,10 @@ class InvoiceOCRGUI:
                 return
 
             # 查找可执行文件
-            main_script = os.path.join(ocr_service_path, "main.py")
-            exe_file = os.path.join(ocr_service_path, "Umi-OCR.exe")
-
-            service_command = None
-            service_type = None
-
-            if os.path.exists(exe_file):
-                service_command = [exe_file]
-                service_type = "可执行文件"
-            elif os.path.exists(main_script):
-                service_command = [sys.executable, main_script]
-                service_type = "Python脚本"
+            from ocr_service_detector import find_ocr_entry
+            entry = find_ocr_entry(ocr_service_path)
+            if entry:
+                service_command, service_type = entry
             else:
                 messagebox.showerror("错误", f"在OCR服务目录中未找到可执行文件:\n"
                                      f"- 尝试查找: Umi-OCR.exe\n"
@@ -811,15 +971,9 @@ class InvoiceOCRGUI:
 
                     except Exception as subprocess_error:
                         raise Exception(f"启动服务进程失败: {subprocess_error}")
-                        import traceback
-                        traceback.print_exc()
-
-                    # 等待一会儿让服务启动
-                    import time
-                    time.sleep(3)
 
-                    # 测试连接
-                    if self.ocr_tool.test_ocr_connection():
+                    # 等待服务就绪（服务应答即返回，不再固定等待）
+                    if self._wait_for_ocr_ready():
                         self.root.after(0, lambda: self.ocr_status_var.set("✅ OCR服务启动成功"))
                         self.root.after(0, lambda: self.start_ocr_btn.grid_forget())
                         self.root.after(0, lambda: messagebox.showinfo("成功", "OCR服务启动成功！"))
@@ -841,10 +995,33 @@ class InvoiceOCRGUI:
             messagebox.showerror("错误", f"准备启动OCR服务时出错: {str(e)}")
             self.start_ocr_btn.config(state="normal", text="🚀 启动OCR服务")
 
+    def _wait_for_ocr_ready(self, timeout=OCR_READY_TIMEOUT):
+        """按指数退避探测OCR服务是否就绪（阻塞，仅在后台线程调用）
+
+        Returns:
+            bool: 服务在超时前应答返回True，否则返回False
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.1
+
+        while True:
+            try:
+                response = self.ocr_tool.session.get(f"{self.ocr_tool.ocr_url}/", timeout=0.5)
+                if response.status_code == 200:
+                    return True
+            except requests.RequestException:
+                pass
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            # 0.1s, 0.2s, 0.4s ... 最长间隔1秒
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 1.0)
+
     def _show_ocr_not_found_dialog(self):
         """显示OCR服务未找到的对话框"""
-        from tkinter import messagebox, filedialog, simpledialog
-
         # 创建自定义对话框
         dialog = tk.Toplevel(self.root)
         dialog.title("OCR服务未找到")
@@ -888,48 +1065,84 @@ class InvoiceOCRGUI:
         result_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
+        # 搜索进度条，仅在后台搜索期间显示
+        search_progress = ttk.Progressbar(dialog, mode='indeterminate')
+
         # 按钮区域
         button_frame = ttk.Frame(dialog)
         button_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
 
-        def auto_search():
-            """自动搜索OCR服务"""
-            result_text.delete(1.0, tk.END)
-            result_text.insert(tk.END, "🔍 正在快速搜索系统中的OCR服务...\n\n")
-            dialog.update()
+        def show_search_text(text):
+            """追加搜索结果文本（主线程，对话框已关闭时忽略）"""
+            if dialog.winfo_exists():
+                result_text.insert(tk.END, text)
 
+        def finish_search(text):
+            """显示最终结果并收起进度条（主线程）"""
+            if not dialog.winfo_exists():
+                return
+            search_progress.stop()
+            search_progress.pack_forget()
+            auto_btn.config(state=tk.NORMAL)
+            result_text.insert(tk.END, text)
+
+        def format_services(title, services):
+            """将找到的服务拼成一段文本，一次性插入"""
+            lines = [f"✅ {title}找到 {len(services)} 个OCR服务：\n\n"]
+            for i, (path, service_type) in enumerate(services, 1):
+                lines.append(f"{i}. {path}\n")
+                lines.append(f"   类型: {service_type}\n\n")
+            return "".join(lines)
+
+        def search_services(force):
+            """在后台线程中搜索，结果通过root.after回到主线程显示"""
             try:
                 from ocr_service_detector import ocr_detector
 
+                # 用户主动点击搜索时忽略之前的搜索结果（可能刚安装了服务）
+                if force:
+                    ocr_detector.invalidate_cache()
+
                 # 首先使用快速搜索
                 services = ocr_detector.find_ocr_services(quick_mode=True)
 
                 if services:
-                    result_text.insert(tk.END, f"✅ 快速搜索找到 {len(services)} 个OCR服务：\n\n")
-                    for i, (path, service_type) in enumerate(services, 1):
-                        result_text.insert(tk.END, f"{i}. {path}\n")
-                        result_text.insert(tk.END, f"   类型: {service_type}\n\n")
+                    text = format_services("快速搜索", services)
                 else:
                     # 如果快速搜索没找到，进行完整搜索
-                    result_text.insert(tk.END, "⏳ 正在进行完整搜索（可能需要较长时间）...\n\n")
-                    dialog.update()
+                    self.root.after(0, show_search_text, "⏳ 正在进行完整搜索（可能需要较长时间）...\n\n")
 
+                    scan_skipped = ocr_detector.is_full_scan_suppressed()
                     services = ocr_detector.find_ocr_services(quick_mode=False)
 
                     if services:
-                        result_text.insert(tk.END, f"✅ 完整搜索找到 {len(services)} 个OCR服务：\n\n")
-                        for i, (path, service_type) in enumerate(services, 1):
-                            result_text.insert(tk.END, f"{i}. {path}\n")
-                            result_text.insert(tk.END, f"   类型: {service_type}\n\n")
+                        text = format_services("完整搜索", services)
                     else:
-                        result_text.insert(tk.END, "❌ 未找到OCR服务\n\n")
-                        result_text.insert(tk.END, "💡 建议：\n")
-                        result_text.insert(tk.END, "1. 确认已安装umi-OCR\n")
-                        result_text.insert(tk.END, "2. 尝试手动指定安装路径\n")
-                        result_text.insert(tk.END, "3. 从官网下载安装：https://github.com/hiroi-sora/Umi-OCR\n")
+                        text = "❌ 未找到OCR服务\n\n"
+                        if scan_skipped:
+                            text += ("ℹ️ 最近的完整搜索未找到服务，本次已跳过全盘搜索；\n"
+                                     "如果刚安装了umi-OCR，请点击“🔍 自动搜索”重新搜索\n\n")
+                        text += ("💡 建议：\n"
+                                 "1. 确认已安装umi-OCR\n"
+                                 "2. 尝试手动指定安装路径\n"
+                                 "3. 从官网下载安装：https://github.com/hiroi-sora/Umi-OCR\n")
 
             except Exception as e:
-                result_text.insert(tk.END, f"❌ 搜索失败: {str(e)}\n")
+                text = f"❌ 搜索失败: {str(e)}\n"
+
+            self.root.after(0, finish_search, text)
+
+        def auto_search(force=False):
+            """自动搜索OCR服务（force为True时重新进行完整搜索）"""
+            result_text.delete(1.0, tk.END)
+            result_text.insert(tk.END, "🔍 正在快速搜索系统中的OCR服务...\n\n")
+
+            # 搜索期间禁用按钮，避免重复启动搜索线程
+            auto_btn.config(state=tk.DISABLED)
+            search_progress.pack(fill=tk.X, padx=20, pady=(0, 10), before=button_frame)
+            search_progress.start(10)
+
+            threading.Thread(target=search_services, args=(force,), daemon=True).start()
 
         def manual_select():
             """手动选择OCR服务路径"""
@@ -939,10 +1152,8 @@ class InvoiceOCRGUI:
             )
             if path:
                 # 检查路径是否有效
-                exe_file = os.path.join(path, "Umi-OCR.exe")
-                main_script = os.path.join(path, "main.py")
-
-                if os.path.exists(exe_file) or os.path.exists(main_script):
+                from ocr_service_detector import find_ocr_entry
+                if find_ocr_entry(path):
                     result_text.delete(1.0, tk.END)
                     result_text.insert(tk.END, f"✅ 已选择OCR服务路径：\n{path}\n\n")
                     result_text.insert(tk.END, "正在启动服务...\n")
@@ -964,11 +1175,10 @@ class InvoiceOCRGUI:
 
         def download_ocr():
             """打开下载页面"""
-            import webbrowser
             webbrowser.open("https://github.com/hiroi-sora/Umi-OCR/releases")
 
         # 按钮
-        auto_btn = ttk.Button(button_frame, text="🔍 自动搜索", command=auto_search)
+        auto_btn = ttk.Button(button_frame, text="🔍 自动搜索", command=lambda: auto_search(force=True))
         auto_btn.pack(side=tk.LEFT, padx=(0, 10))
 
         manual_btn = ttk.Button(button_frame, text="📁 手动选择", command=manual_select)
@@ -985,24 +1195,12 @@ class InvoiceOCRGUI:
 
     def _start_ocr_service_with_path(self, ocr_service_path: str):
         """使用指定路径启动OCR服务"""
-        import subprocess
-        import os
-        import sys
-
         try:
             # 查找可执行文件
-            main_script = os.path.join(ocr_service_path, "main.py")
-            exe_file = os.path.join(ocr_service_path, "Umi-OCR.exe")
-
-            service_command = None
-            service_type = None
-
-            if os.path.exists(exe_file):
-                service_command = [exe_file]
-                service_type = "可执行文件"
-            elif os.path.exists(main_script):
-                service_command = [sys.executable, main_script]
-                service_type = "Python脚本"
+            from ocr_service_detector import find_ocr_entry
+            entry = find_ocr_entry(ocr_service_path)
+            if entry:
+                service_command, service_type = entry
             else:
                 messagebox.showerror("错误", f"在OCR服务目录中未找到可执行文件:\n"
                                      f"- 尝试查找: Umi-OCR.exe\n"
@@ -1040,16 +1238,14 @@ class InvoiceOCRGUI:
                             cwd=ocr_service_path
                         )
 
-                    # 等待一段时间检查服务是否启动成功
-                    import time
-                    time.sleep(3)
-
-                    # 在主线程中更新UI
-                    self.root.after(0, lambda: self._check_ocr_service_after_start())
+                    # 在后台线程中等待服务就绪，主线程只负责更新界面
+                    ready = self._wait_for_ocr_ready()
+                    self.root.after(0, lambda: self._apply_ocr_status(ready))
 
                 except Exception as e:
-                    # 在主线程中显示错误
-                    self.root.after(0, lambda: self._show_ocr_start_error(str(e)))
+                    # 在主线程中显示错误（except块结束后e会被删除，先取出错误信息）
+                    error_msg = str(e)
+                    self.root.after(0, self._show_ocr_start_error, error_msg)
 
             # 在后台线程中启动服务
             threading.Thread(target=start_service, daemon=True).start()
@@ -1058,12 +1254,19 @@ class InvoiceOCRGUI:
             messagebox.showerror("错误", f"准备启动OCR服务时出错: {str(e)}")
             self.start_ocr_btn.config(state="normal", text="🚀 启动OCR服务")
 
+    @staticmethod
+    def _count_total_fields():
+        """获取当前配置的字段总数"""
+        if FIELD_CONFIG_AVAILABLE:
+            return len(field_config_manager.get_field_names())
+        return 6
+
     def load_fields_list(self):
         """加载并显示当前字段配置列表"""
-        # 清空现有显示
-        for item in self.fields_tree.get_children():
-            self.fields_tree.delete(item)
+        self._total_fields = self._count_total_fields()
 
+        # 先组装期望显示的行 (行ID, 值, 标签)，再与表格现有内容比对
+        rows = []
         try:
             if FIELD_CONFIG_AVAILABLE:
                 # 从字段配置管理器获取字段
@@ -1074,16 +1277,16 @@ class InvoiceOCRGUI:
                         status = "必需" if field_def.required else "可选"
                         tags = ('required',) if field_def.required else ('optional',)
 
-                        self.fields_tree.insert('', 'end', values=(
+                        rows.append((f"field:{field_name}", (
                             field_name,
                             f"类型: {field_def.field_type} | {field_def.description[:50]}...",
                             status
-                        ), tags=tags)
+                        ), tags))
                 else:
                     # 如果没有字段配置，显示默认提示
-                    self.fields_tree.insert('', 'end', values=(
+                    rows.append(("field:empty", (
                         "暂无字段配置", "请使用字段配置管理器添加字段", "⚠️"
-                    ), tags=('warning',))
+                    ), ('warning',)))
             else:
                 # 如果字段配置不可用，显示默认字段
                 default_fields = [
@@ -1092,19 +1295,42 @@ class InvoiceOCRGUI:
                 ]
 
                 for field_name in default_fields:
-                    self.fields_tree.insert('', 'end', values=(
+                    rows.append((f"field:{field_name}", (
                         field_name, "默认字段", "✅"
-                    ), tags=('optional',))
+                    ), ('optional',)))
 
         except Exception as e:
             self.logger.error(f"加载字段列表失败: {e}")
-            self.fields_tree.insert('', 'end', values=(
+            rows = [("field:error", (
                 "加载失败", f"错误: {str(e)}", "❌"
-            ), tags=('error',))
+            ), ('error',))]
+
+        self._sync_fields_tree(rows)
+
+    def _sync_fields_tree(self, rows):
+        """按行ID比对字段表格，字段集合未变时只更新有变化的行，否则一次性重建"""
+        existing = self.fields_tree.get_children()
+
+        if existing == tuple(iid for iid, _, _ in rows):
+            for iid, values, tags in rows:
+                item = self.fields_tree.item(iid)
+                if tuple(item['values']) != values or tuple(item['tags']) != tags:
+                    self.fields_tree.item(iid, values=values, tags=tags)
+            return
+
+        self.fields_tree.delete(*existing)
+        for iid, values, tags in rows:
+            self.fields_tree.insert('', 'end', iid=iid, values=values, tags=tags)
 
     def refresh_fields_display(self):
         """刷新字段显示（从字段配置管理器重新加载）"""
+        # 字段配置管理器运行在独立进程中，修改只保存到配置文件，需要重新读取
+        if FIELD_CONFIG_AVAILABLE:
+            field_config_manager.load_config()
         self.load_fields_list()
+
+        # 字段配置可能已修改，旧的解析结果不再适用
+        self.ocr_tool.clear_caches()
         self.progress_var.set("✅ 字段列表已刷新")
 
     def export_results(self):
@@ -1113,13 +1339,12 @@ class InvoiceOCRGUI:
             messagebox.showwarning("警告", "没有可导出的结果")
             return
 
+        payload = self._build_export_payload()
+
         # 直接询问保存位置并导出为Excel
         file_path = filedialog.asksaveasfilename(
             title="保存Excel结果",
-            filetypes=[
-                ("Excel文件", "*.xlsx"),
-                ("所有文件", "*.*")
-            ],
+            filetypes=SAVE_FILE_TYPES_EXCEL,
             defaultextension=".xlsx",
             initialfile=f"发票识别结果_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         )
@@ -1128,17 +1353,8 @@ class InvoiceOCRGUI:
             return
 
         try:
-            # 准备Excel数据
-            excel_data = {
-                '图片路径': self.current_image_path or '',
-                '处理时间': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                '解析方式': self.method_var.get(),
-                'AI置信度': self.ai_confidence,
-                '提取字段': self.current_result.get('提取字段', {})
-            }
-
             # 使用Excel导出器导出
-            if not self.excel_exporter.export_single_invoice(file_path, excel_data, "horizontal"):
+            if not self.excel_exporter.export_single_invoice(file_path, payload, "horizontal"):
                 raise ValueError("Excel文件导出失败")
 
             messagebox.showinfo("成功", f"结果已成功导出到:\n{file_path}")
@@ -1154,27 +1370,22 @@ class InvoiceOCRGUI:
             return
 
         # 收集字段数据
-        fields_data = self.current_result.get('提取字段', {})
+        payload = self._build_export_payload()
+        fields_data = payload['提取字段']
+        processed_at = payload['处理时间']
 
         if format_type == "json":
             # 完整结果数据
-            result_data = {
-                '图片路径': self.current_image_path or '',
-                '处理时间': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                '解析方式': self.method_var.get(),
-                'AI置信度': self.ai_confidence,
-                '提取字段': fields_data,
-                'OCR原始结果': self.current_result.get('OCR原始结果')
-            }
+            result_data = dict(payload)
+            result_data['OCR原始结果'] = self.current_result.get('OCR原始结果')
 
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(result_data, f, ensure_ascii=False, indent=2)
+            self._write_json_file(file_path, result_data)
 
         elif format_type == "txt":
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write("=== 发票识别结果 ===\n\n")
                 f.write(f"图片路径: {self.current_image_path or 'N/A'}\n")
-                f.write(f"处理时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+                f.write(f"处理时间: {processed_at}\n")
                 f.write(f"解析方式: {self.method_var.get()}\n")
                 if self.ai_confidence:
                     f.write(f"AI置信度: {self.ai_confidence:.1%}\n")
@@ -1184,7 +1395,6 @@ class InvoiceOCRGUI:
                     f.write(f"{field}: {value or '未识别'}\n")
 
         elif format_type == "csv":
-            import csv
             with open(file_path, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 writer.writerow(['字段名称', '提取内容', '识别状态'])
@@ -1196,19 +1406,39 @@ class InvoiceOCRGUI:
             if not self.excel_enabled:
                 raise ValueError("Excel导出功能不可用，请确保安装了openpyxl库")
 
-            # 准备Excel数据
-            excel_data = {
-                '图片路径': self.current_image_path or '',
-                '处理时间': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                '解析方式': self.method_var.get(),
-                'AI置信度': self.ai_confidence,
-                '提取字段': fields_data
-            }
-
             # 默认使用横向格式导出
-            if not self.excel_exporter.export_single_invoice(file_path, excel_data, "horizontal"):
+            if not self.excel_exporter.export_single_invoice(file_path, payload, "horizontal"):
                 raise ValueError("Excel文件导出失败")
 
+    def _build_export_payload(self):
+        """构建单张发票的导出数据（每次导出时构建，处理时间为本次导出时间）"""
+        return {
+            '图片路径': self.current_image_path or '',
+            '处理时间': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            '解析方式': self.method_var.get(),
+            'AI置信度': self.ai_confidence,
+            '提取字段': self.current_result.get('提取字段', {})
+        }
+
+    @staticmethod
+    def _write_json_file(file_path, data):
+        """以缩进格式写入JSON文件，优先使用orjson"""
+        if ORJSON_AVAILABLE:
+            try:
+                content = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                # orjson不支持的类型交给标准库处理
+                content = None
+            if content is not None:
+                with open(file_path, 'wb') as f:
+                    f.write(content)
+                return
+
+        # 先完整序列化再打开文件，序列化失败时不会留下写了一半的文件
+        content = json.dumps(data, ensure_ascii=False, indent=2)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
     def batch_process(self):
         """批量处理功能"""
         # 选择批量处理的文件目录
@@ -1224,12 +1454,12 @@ class InvoiceOCRGUI:
         batch_window.transient(self.root)
         batch_window.grab_set()
 
-        # 获取目录中的图片和PDF文件
-        image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff']
-        supported_files = [
-            f for f in os.listdir(directory)
-            if any(f.lower().endswith(ext) for ext in image_extensions + ['.pdf'])
-        ]
+        # 获取目录中的图片和PDF文件 (文件名, 完整路径)，scandir自带文件类型，无需额外stat
+        with os.scandir(directory) as entries:
+            supported_files = [
+                (entry.name, entry.path) for entry in entries
+                if entry.name.lower().endswith(BATCH_FILE_EXTENSIONS) and entry.is_file()
+            ]
 
         if not supported_files:
             messagebox.showwarning("警告", "目录中没有找到支持的图片或PDF文件")
@@ -1275,65 +1505,91 @@ class InvoiceOCRGUI:
 
         results_data = []
 
-        def process_batch():
-            for i, filename in enumerate(supported_files):
-                try:
-                    # 更新进度
-                    file_type = "PDF" if filename.lower().endswith('.pdf') else "图片"
-                    progress_var.set(f"正在处理: {filename} ({i+1}/{len(supported_files)}) - {file_type}")
-                    progress_bar['value'] = i + 1
-                    batch_window.update()
-
-                    # 处理文件
-                    file_path = os.path.join(directory, filename)
-                    result = self.ocr_tool.process_invoice(file_path)
-
-                    # 提取信息
-                    if result and result.get('提取字段'):
-                        fields = result.get('提取字段', {})
-                        field_count = len([v for v in fields.values() if v])
-                        status = "成功"
-                        parsing_method = getattr(result, 'parsing_method', '未知')
-                        confidence = getattr(result, 'ai_confidence', 0)
-
-                        # 更新结果列表
-                        batch_window.after(0, lambda f=filename, t=file_type, s=status,
-                                      p=parsing_method, c=field_count, conf=confidence:
-                                      result_tree.insert('', 'end',
-                                      values=(f, t, s, p, f"{c}/6", f"{conf:.1%}" if conf else "")))
-
-                        results_data.append({
-                            'filename': filename,
-                            'type': file_type,
-                            'status': status,
-                            'parsing_method': parsing_method,
-                            'field_count': field_count,
-                            'confidence': confidence,
-                            'result': result,
-                            'file_path': file_path
-                        })
-                    else:
-                        status = "失败"
-                        parsing_method = "未知"
-                        batch_window.after(0, lambda f=filename, t=file_type:
-                                      result_tree.insert('', 'end',
-                                      values=(f, t, status, parsing_method, "0/6", "")))
-
-                except Exception as e:
-                    error_status = f"错误: {str(e)[:20]}"
-                    batch_window.after(0, lambda f=filename, t=file_type if 'filename' in locals() else '未知':
-                                      result_tree.insert('', 'end',
-                                      values=(f, t or '未知', error_status, "未知", "0/6", "")))
-
-            # 处理完成
-            success_count = len([r for r in results_data if r['status'] == '成功'])
-            ai_count = len([r for r in results_data if 'AI' in r['parsing_method']])
+        def process_file(filename, file_path):
+            """处理单个文件（在线程池中执行），返回 (结果列表行, 结果记录或None)"""
+            file_type = "PDF" if filename.lower().endswith('.pdf') else "图片"
+            try:
+                result = self.ocr_tool.process_invoice(file_path)
+
+                # 提取信息
+                if result and result.get('提取字段'):
+                    fields = result.get('提取字段', {})
+                    field_count = sum(1 for v in fields.values() if v)
+                    status = "成功"
+                    parsing_method = getattr(result, 'parsing_method', '未知')
+                    confidence = getattr(result, 'ai_confidence', 0)
+
+                    row = (filename, file_type, status, parsing_method,
+                           f"{field_count}/6", f"{confidence:.1%}" if confidence else "")
+                    return row, {
+                        'filename': filename,
+                        'type': file_type,
+                        'status': status,
+                        'parsing_method': parsing_method,
+                        'field_count': field_count,
+                        'confidence': confidence,
+                        'result': result,
+                        'file_path': file_path
+                    }
+
+                return (filename, file_type, "失败", "未知", "0/6", ""), None
 
-            batch_window.after(0, lambda: progress_var.set(
+            except Exception as e:
+                error_status = f"错误: {str(e)[:20]}"
+                return (filename, file_type, error_status, "未知", "0/6", ""), None
+
+        def count_results():
+            """一次遍历统计成功数量和AI识别数量"""
+            success_count = ai_count = 0
+            for record in results_data:
+                success_count += record['status'] == '成功'
+                ai_count += 'AI' in record['parsing_method']
+            return success_count, ai_count
+
+        def update_progress(rows, done, filename, file_type):
+            """在主线程中插入新结果行并更新进度"""
+            for values in rows:
+                result_tree.insert('', 'end', values=values)
+            progress_var.set(f"已处理: {filename} ({done}/{len(supported_files)}) - {file_type}")
+            progress_bar['value'] = done
+
+        def finish_batch():
+            """在主线程中显示处理汇总并恢复开始按钮"""
+            success_count, ai_count = count_results()
+            progress_var.set(
                 f"✅ 批量处理完成！成功: {success_count}/{len(supported_files)} "
                 f"(AI识别: {ai_count})"
-            ))
-            batch_window.after(0, lambda: progress_bar['value'], len(supported_files))
+            )
+            start_button.config(state='normal')
+
+        def process_batch(max_workers):
+            pending_rows = []
+            last_ui_update = 0.0
+
+            try:
+                # OCR请求是IO密集型，多个文件并发提交给OCR服务，按完成顺序显示结果
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {executor.submit(process_file, filename, file_path): filename
+                               for filename, file_path in supported_files}
+
+                    for i, future in enumerate(as_completed(futures)):
+                        filename = futures[future]
+                        row, record = future.result()
+
+                        # 结果只在当前线程汇总，无需加锁
+                        if record:
+                            results_data.append(record)
+                        pending_rows.append(row)
+
+                        # 界面更新限制在每秒10次以内，积攒的结果行一并插入；最后一个文件总是刷新
+                        now = time.monotonic()
+                        if now - last_ui_update >= BATCH_UI_UPDATE_INTERVAL or i + 1 == len(supported_files):
+                            last_ui_update = now
+                            batch_window.after(0, update_progress, pending_rows, i + 1, filename, row[1])
+                            pending_rows = []
+            finally:
+                # 处理完成（排在最后一次进度更新之后执行）
+                batch_window.after(0, finish_batch)
 
         def export_batch():
             if not results_data:
@@ -1342,11 +1598,7 @@ class InvoiceOCRGUI:
 
             file_path = filedialog.asksaveasfilename(
                 title="保存批量结果",
-                filetypes=[
-                    ("Excel文件", "*.xlsx"),
-                    ("JSON文件", "*.json"),
-                    ("CSV文件", "*.csv")
-                ],
+                filetypes=SAVE_FILE_TYPES_BATCH,
                 defaultextension=".xlsx"
             )
 
@@ -1370,29 +1622,36 @@ class InvoiceOCRGUI:
                             messagebox.showinfo("成功", f"批量结果已保存到: {file_path}")
                         else:
                             messagebox.showerror("错误", "Excel导出失败")
-                    else:
-                        # JSON或CSV格式
+                    elif file_path.endswith('.json'):
+                        success_count, ai_count = count_results()
                         batch_result = {
                             '处理时间': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                             '总数': len(supported_files),
                             '成功数量': success_count,
                             'AI识别数量': ai_count,
-                            '结果': results_data
+                            # 识别结果对象转换为普通字典后才能序列化
+                            '结果': [
+                                dict(item, result=item['result'].to_dict() if item['result'] else None)
+                                for item in results_data
+                            ]
                         }
 
-                        with open(file_path, 'w', encoding='utf-8') as f:
-                            if file_path.endswith('.json'):
-                                json.dump(batch_result, f, ensure_ascii=False, indent=2)
-                            else:  # CSV
-                                import csv
-                                writer = csv.writer(f)
-                                writer.writerow(['文件名', '类型', '状态', '解析方式', '识别字段数', '置信度'])
-                                for item in results_data:
-                                    writer.writerow([
-                                        item['filename'], item['type'], item['status'],
-                                        item['parsing_method'], f"{item['field_count']}/6",
-                                        f"{item['confidence']:.1%}" if item['confidence'] else ""
-                                    ])
+                        self._write_json_file(file_path, batch_result)
+
+                        messagebox.showinfo("成功", f"批量结果已保存到: {file_path}")
+                    else:  # CSV
+                        rows = [
+                            (item['filename'], item['type'], item['status'],
+                             item['parsing_method'], f"{item['field_count']}/6",
+                             f"{item['confidence']:.1%}" if item['confidence'] else "")
+                            for item in results_data
+                        ]
+
+                        # csv模块要求newline=''，否则Windows下每行之后会多出空行
+                        with open(file_path, 'w', encoding='utf-8', newline='') as f:
+                            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+                            writer.writerow(['文件名', '类型', '状态', '解析方式', '识别字段数', '置信度'])
+                            writer.writerows(rows)
 
                         messagebox.showinfo("成功", f"批量结果已保存到: {file_path}")
 
@@ -1403,31 +1662,37 @@ class InvoiceOCRGUI:
         button_frame = ttk.Frame(batch_window)
         button_frame.pack(pady=10)
 
-        def start_batch():
-            threading.Thread(target=process_batch, daemon=True).start()
+        # 并发数（同时提交给OCR服务的文件数）
+        ttk.Label(button_frame, text="并发数:").pack(side='left')
+        workers_var = tk.IntVar(value=BATCH_MAX_WORKERS)
+        ttk.Spinbox(button_frame, from_=1, to=16, width=4,
+                    textvariable=workers_var).pack(side='left', padx=(0, 10))
 
-        ttk.Button(button_frame, text="开始批量处理", command=start_batch).pack(side='left', padx=5)
+        def start_batch():
+            try:
+                max_workers = min(max(workers_var.get(), 1), 16)
+            except tk.TclError:
+                max_workers = BATCH_MAX_WORKERS
+            # 处理期间禁用按钮，避免再次点击启动并发的批量处理写入同一结果列表
+            start_button.config(state='disabled')
+            threading.Thread(target=process_batch, args=(max_workers,), daemon=True).start()
+
+        start_button = ttk.Button(button_frame, text="开始批量处理", command=start_batch)
+        start_button.pack(side='left', padx=5)
         ttk.Button(button_frame, text="导出结果", command=export_batch).pack(side='left', padx=5)
         ttk.Button(button_frame, text="关闭", command=batch_window.destroy).pack(side='left', padx=5)
 
-    def _check_ocr_service_after_start(self):
-        """检查OCR服务启动后的状态"""
-        try:
-            import requests
-            response = requests.get("http://127.0.0.1:1224", timeout=5)
-            if response.status_code == 200:
-                self.ocr_status_var.set("✅ OCR服务已连接")
-                self.start_ocr_btn.pack_forget()  # 隐藏启动按钮
-                self.show_success("OCR服务启动成功！")
-                self.logger.info("OCR服务启动并连接成功")
-            else:
-                self.ocr_status_var.set("❌ OCR服务连接失败")
-                self.start_ocr_btn.config(state="normal", text="🚀 重试启动OCR服务")
-                self.show_error("OCR服务启动失败，请检查服务是否正常运行")
-        except Exception as e:
+    def _apply_ocr_status(self, ready: bool):
+        """根据OCR服务启动后的探测结果更新界面（主线程）"""
+        if ready:
+            self.ocr_status_var.set("✅ OCR服务已连接")
+            self.start_ocr_btn.grid_forget()  # 隐藏启动按钮
+            messagebox.showinfo("成功", "OCR服务启动成功！")
+            self.logger.info("OCR服务启动并连接成功")
+        else:
             self.ocr_status_var.set("❌ OCR服务连接失败")
             self.start_ocr_btn.config(state="normal", text="🚀 重试启动OCR服务")
-            self.show_error(f"OCR服务启动失败: {str(e)}")
+            self.show_error("OCR服务启动失败，请检查服务是否正常运行")
 
     def _show_ocr_start_error(self, error_msg):
         """显示OCR启动错误"""
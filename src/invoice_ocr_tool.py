@@ -6,13 +6,22 @@
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import argparse
+import glob
 import sys
 import re
 import os
-import base64
-from datetime import datetime
+import io
+import socket
+import binascii
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import time
 from typing import Dict, Optional, List, Any
 import logging
 
@@ -24,9 +33,39 @@ except ImportError:
     AI_AVAILABLE = False
     logging.warning("AI智能解析功能不可用，请确保安装了anthropic库")
 
+# 可选的orjson加速JSON解析和序列化
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 可选的SIMD加速base64编码
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
+
 
 class InvoiceResult:
     """发票识别结果类"""
+    __slots__ = ('image_path', 'processing_time', 'extracted_fields', 'ocr_result',
+                 'parsing_method', 'ai_confidence', 'ai_analysis', 'full_text')
+
+    # 字典式访问的键与属性名的对应关系
+    _KEY_MAP = {
+        '图片路径': 'image_path',
+        '处理时间': 'processing_time',
+        '提取字段': 'extracted_fields',
+        'OCR原始结果': 'ocr_result',
+        '解析方式': 'parsing_method',
+        'AI置信度': 'ai_confidence',
+        'AI原始响应': 'ai_analysis',
+        'AI分析结果': 'ai_analysis',
+        '完整文本': 'full_text'
+    }
+
     def __init__(self, image_path: str, processing_time: str, extracted_fields: Dict[str, str],
                  ocr_result: Dict[str, Any] = None, parsing_method: str = "📝 传统正则解析",
                  ai_confidence: float = None, ai_analysis: str = None, full_text: str = ""):
@@ -41,24 +80,29 @@ class InvoiceResult:
 
     def get(self, key: str, default=None):
         """字典式访问"""
-        mapping = {
-            '图片路径': self.image_path,
-            '处理时间': self.processing_time,
-            '提取字段': self.extracted_fields,
-            'OCR原始结果': self.ocr_result,
-            '解析方式': self.parsing_method,
-            'AI置信度': self.ai_confidence,
-            'AI原始响应': self.ai_analysis,
-            'AI分析结果': self.ai_analysis,
-            '完整文本': self.full_text
-        }
-        return mapping.get(key, default)
+        attr = self._KEY_MAP.get(key)
+        if attr is None:
+            return default
+        return getattr(self, attr)
 
     def __getitem__(self, key: str):
         return self.get(key)
 
     def __contains__(self, key: str):
-        return key in ['图片路径', '处理时间', '提取字段', 'OCR原始结果', '解析方式', 'AI置信度', 'AI原始响应', 'AI分析结果', '完整文本']
+        return key in self._KEY_MAP
+
+    def to_dict(self, include_raw_ocr: bool = False) -> Dict[str, Any]:
+        """转换为可序列化的字典，默认不包含OCR原始结果"""
+        data = {
+            '图片路径': self.image_path,
+            '处理时间': self.processing_time,
+            '解析方式': self.parsing_method,
+            'AI置信度': self.ai_confidence,
+            '提取字段': self.extracted_fields
+        }
+        if include_raw_ocr:
+            data['OCR原始结果'] = self.ocr_result
+        return data
 
 # 导入字段配置管理器
 try:
@@ -77,6 +121,192 @@ except ImportError:
     logging.warning("Excel导出功能不可用，请确保安装了openpyxl库")
 
 
+# OCR连接池大小，与批量处理的最大并发数一致，保证每个线程都能复用长连接
+OCR_POOL_SIZE = 16
+
+# 服务检测超时（秒）：端口探测只需确认本机端口在监听；
+# HTTP探测的连接超时要短，读取超时留足余量，避免服务忙于识别时被误判为未启动
+OCR_PORT_PROBE_TIMEOUT = 0.5
+OCR_HTTP_PROBE_TIMEOUT = (1, 5)
+
+# OCR服务暂时不可用时的重试策略：只重试502/503/504状态码
+# 连接被拒绝说明服务未启动，不重试，避免拖慢服务状态检测；
+# 读取超时说明服务正忙于识别，重发只会让同一任务重复执行，也不重试
+OCR_RETRY = Retry(
+    total=2,
+    connect=0,
+    read=0,
+    backoff_factor=0.2,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({'GET', 'POST'}),
+    raise_on_status=False
+)
+
+# 本机地址：访问这些地址时不读取系统代理设置
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+# 批量处理默认并发数
+BATCH_MAX_WORKERS = 4
+
+# PDF渲染倍率（2.0约为144DPI，保证OCR精度）
+PDF_RENDER_SCALE = 2.0
+
+# PDF页面转图片的JPEG质量：编码比PNG快得多，体积约为PNG的几分之一，
+# 质量90下文字边缘清晰，不影响识别
+PDF_JPEG_QUALITY = 90
+
+# 图片最长边超过此值时先缩小再发送：OCR检测阶段只使用1024边长，
+# 保留一定余量给文字识别，同时大幅减小请求体和base64编码量
+OCR_IMAGE_MAX_SIDE = 1600
+
+# 缩小后图片的JPEG质量
+OCR_IMAGE_JPEG_QUALITY = 88
+
+# 多页PDF同时发送的OCR请求数
+PDF_OCR_MAX_WORKERS = 4
+
+# pdfium不是线程安全的（不同文档之间也不行），所有打开、渲染、关闭操作都持有此锁
+PDFIUM_LOCK = threading.Lock()
+
+# 读取图片文件时使用的缓冲区大小
+FILE_READ_BUFFER_SIZE = 1024 * 1024
+
+# OCR请求的可选参数
+OCR_OPTIONS = {
+    'det_limit_side_len': 1024,
+    'cls': True,
+    'rec': True
+}
+
+# OCR请求体在base64数据前后的固定部分，预先序列化，请求时直接拼接字节
+OCR_REQUEST_PREFIX = b'{"base64":"'
+OCR_REQUEST_SUFFIX = ('","options":' + json.dumps(OCR_OPTIONS) + '}').encode('utf-8')
+
+# 缓存容量：按文件内容缓存OCR结果，按识别文本缓存字段解析结果
+OCR_CACHE_SIZE = 64
+PARSE_CACHE_SIZE = 256
+
+# 金额数字（支持千分位和两位小数）
+_AMOUNT_NUMBER = r'(\d+(?:,\d{3})*(?:\.\d{2})?)'
+
+# 标签与金额之间的空白和可选的￥符号。写成\s*(?:￥\s*)?而不是\s*￥?\s*：
+# 两者匹配的内容相同，但后者在长串空白后匹配失败时会二次方回溯
+_AMOUNT_PREFIX = r'\s*(?:￥\s*)?'
+
+
+def _fuse_patterns(patterns):
+    """将同一字段的多个模式合并为带命名分组(p0, p1, ...)的交替式"""
+    fused = '|'.join(f'(?P<p{i}>{p.pattern})' for i, p in enumerate(patterns))
+    return re.compile(fused, patterns[0].flags)
+
+
+def _search_by_priority(patterns, fused, text, keywords=None):
+    """
+    按优先级查找第一个能匹配的模式，结果与逐个调用pattern.search相同
+
+    合并模式找到的是文本中最早的候选位置。若命中的不是最高优先级的模式，
+    更高优先级的模式在该位置之前必定不匹配，只需从下一个位置继续查找。
+    keywords为各模式开头的固定关键字：文本中一个都没有时直接跳过正则匹配，
+    否则从最早出现的关键字处开始扫描，之前的文本不可能产生匹配。
+    """
+    begin = 0
+    if keywords:
+        positions = [pos for pos in map(text.find, keywords) if pos >= 0]
+        if not positions:
+            return None
+        begin = min(positions)
+
+    match = fused.search(text, begin)
+    if match is None:
+        return None
+
+    index = int(match.lastgroup[1:])
+    start = match.start()
+    for pattern in patterns[:index]:
+        higher = pattern.search(text, start + 1)
+        if higher:
+            return higher
+    return patterns[index].match(text, start)
+
+
+# 以下为内置字段的提取模式，模块加载时预编译，按优先级排列
+# *_KEYWORDS为对应模式开头的固定关键字，用于在正则匹配前定位扫描起点；
+# 发票号码和开票日期含有无关键字的兜底模式，不做预检查
+# 1. 发票号码
+INVOICE_NUMBER_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'发票号码[:：]?\s*(\w+)',
+    r'No\.?\s*[:：]?\s*(\w+)',
+    r'Invoice\s*No\.?[:：]?\s*(\w+)',
+    r'(\d{8,12})',  # 8-12位数字
+))
+
+# 2. 开票日期
+DATE_PATTERNS = tuple(re.compile(p) for p in (
+    r'开票日期[:：]?\s*(\d{4}[-/年]\d{1,2}[-/月]\d{1,2}日?)',
+    r'Date[:：]?\s*(\d{4}[-/]\d{1,2}[-/]\d{1,2})',
+    r'(\d{4}[-/年]\d{1,2}[-/月]\d{1,2}日?)',
+))
+
+# 3. 销售方名称
+SELLER_PATTERNS = tuple(re.compile(p) for p in (
+    r'销售方[:：]?\s*([^开票方购买方收款方付款方\s]{2,20})',
+    r'收款人[:：]?\s*([^开票方购买方收款方付款方\s]{2,20})',
+    r'Seller[:：]?\s*([^\n]{2,30})',
+))
+SELLER_KEYWORDS = ('销售方', '收款人', 'Seller')
+
+# 4. 购买方名称
+BUYER_PATTERNS = tuple(re.compile(p) for p in (
+    r'购买方[:：]?\s*([^开票方购买方收款方付款方\s]{2,20})',
+    r'付款人[:：]?\s*([^开票方购买方收款方付款方\s]{2,20})',
+    r'Buyer[:：]?\s*([^\n]{2,30})',
+))
+BUYER_KEYWORDS = ('购买方', '付款人', 'Buyer')
+
+# 5. 合计金额
+AMOUNT_PATTERNS = tuple(re.compile(p) for p in (
+    r'价税合计[:：]?' + _AMOUNT_PREFIX + _AMOUNT_NUMBER,
+    r'合计金额[:：]?' + _AMOUNT_PREFIX + _AMOUNT_NUMBER,
+    r'Total[:：]?' + _AMOUNT_PREFIX + _AMOUNT_NUMBER,
+    r'￥' + _AMOUNT_NUMBER,
+))
+AMOUNT_KEYWORDS = ('价税合计', '合计金额', 'Total', '￥')
+
+# 6. 税额
+TAX_PATTERNS = tuple(re.compile(p) for p in (
+    r'税额[:：]?' + _AMOUNT_PREFIX + _AMOUNT_NUMBER,
+    r'增值税[:：]?' + _AMOUNT_PREFIX + _AMOUNT_NUMBER,
+    r'Tax[:：]?' + _AMOUNT_PREFIX + _AMOUNT_NUMBER,
+))
+TAX_KEYWORDS = ('税额', '增值税', 'Tax')
+
+# 每个字段的模式合并成一个交替式，先扫描一遍文本确定最早出现的候选
+INVOICE_NUMBER_RE = _fuse_patterns(INVOICE_NUMBER_PATTERNS)
+DATE_RE = _fuse_patterns(DATE_PATTERNS)
+SELLER_RE = _fuse_patterns(SELLER_PATTERNS)
+BUYER_RE = _fuse_patterns(BUYER_PATTERNS)
+AMOUNT_RE = _fuse_patterns(AMOUNT_PATTERNS)
+TAX_RE = _fuse_patterns(TAX_PATTERNS)
+
+# 不含税金额（用于推算税额）
+AMOUNT_WITHOUT_TAX_PATTERN = re.compile(r'不含税金额[:：]?' + _AMOUNT_PREFIX + _AMOUNT_NUMBER)
+
+
+# 最近一次格式化的时间 (整秒时间戳, 字符串)
+_last_timestamp = (None, "")
+
+
+def _format_now() -> str:
+    """返回当前时间字符串（YYYY-MM-DD HH:MM:SS），同一秒内复用上次的格式化结果"""
+    global _last_timestamp
+    second = int(time.time())
+    cached_second, text = _last_timestamp
+    if second != cached_second:
+        text = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(second))
+        _last_timestamp = (second, text)
+    return text
+
+
 class InvoiceOCRTool:
     """发票OCR识别工具类"""
 
@@ -91,11 +321,19 @@ class InvoiceOCRTool:
             use_ai: 是否使用AI智能解析
             ai_config: AI配置参数
         """
+        self.ocr_host = ocr_host
+        self.ocr_port = ocr_port
         self.ocr_url = f"http://{ocr_host}:{ocr_port}"
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'InvoiceOCRTool/2.0-AI'
+            'User-Agent': 'InvoiceOCRTool/2.0-AI',
+            'Connection': 'keep-alive'
         })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=OCR_POOL_SIZE, max_retries=OCR_RETRY)
+        self.session.mount(f"{self.ocr_url}/", adapter)
+        if ocr_host in LOOPBACK_HOSTS:
+            # 本机服务不经过代理，跳过系统代理设置的读取（Windows下会触发反向DNS查询）
+            self.session.trust_env = False
 
         # 设置日志
         logging.basicConfig(
@@ -127,131 +365,286 @@ class InvoiceOCRTool:
         else:
             self.logger.warning("Excel导出功能不可用")
 
-    def test_ocr_connection(self) -> bool:
-        """测试OCR服务连接"""
+        # OCR结果和字段解析结果缓存，批量处理会在多个线程中共用，读写时加锁
+        self._ocr_cache = OrderedDict()
+        self._parse_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # PDF渲染时复用的JPEG编码缓冲区，批量处理时各线程各用一个
+        self._render_local = threading.local()
+
+    @staticmethod
+    def _content_hash(data) -> bytes:
+        """计算内容哈希（blake2b），用作缓存键"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def _cache_get(self, cache, key):
+        """读取LRU缓存，命中时移到末尾"""
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, cache, key, value, max_size):
+        """写入LRU缓存，超出容量时淘汰最旧的条目"""
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > max_size:
+                cache.popitem(last=False)
+
+    def _render_pdf_page(self, page) -> bytes:
+        """将PDF页面渲染为JPEG数据"""
+        image_stream = getattr(self._render_local, 'buffer', None)
+        if image_stream is None:
+            image_stream = self._render_local.buffer = io.BytesIO()
+        image_stream.seek(0)
+        image_stream.truncate()
+
+        bitmap = page.render(scale=PDF_RENDER_SCALE)
+        try:
+            # to_pil直接引用位图缓冲区，不额外拷贝像素
+            bitmap.to_pil().save(image_stream, format='JPEG', quality=PDF_JPEG_QUALITY)
+            # getvalue返回副本，缓冲区可以安全地用于下一页
+            return image_stream.getvalue()
+        finally:
+            bitmap.close()
+
+    @staticmethod
+    def _shrink_image(image_data: bytes) -> bytes:
+        """图片过大时缩小并重新编码为JPEG，无法处理或无需缩小时返回原数据"""
+        try:
+            from PIL import Image, ImageOps
+
+            with Image.open(io.BytesIO(image_data)) as im:
+                if max(im.size) <= OCR_IMAGE_MAX_SIDE:
+                    return image_data
+                # JPEG在解码阶段直接按比例缩小，避免解码全分辨率像素
+                im.draft('RGB', (OCR_IMAGE_MAX_SIDE, OCR_IMAGE_MAX_SIDE))
+                im.thumbnail((OCR_IMAGE_MAX_SIDE, OCR_IMAGE_MAX_SIDE), Image.Resampling.LANCZOS)
+                # 重新编码会丢失EXIF方向信息，先按方向旋转
+                im = ImageOps.exif_transpose(im)
+                if im.mode not in ('RGB', 'L'):
+                    im = im.convert('RGB')
+                image_stream = io.BytesIO()
+                im.save(image_stream, format='JPEG', quality=OCR_IMAGE_JPEG_QUALITY)
+        except Exception:
+            return image_data
+
+        shrunk = image_stream.getvalue()
+        return shrunk if len(shrunk) < len(image_data) else image_data
+
+    @staticmethod
+    def _encode_base64(data: bytes) -> bytes:
+        """base64编码，优先使用pybase64，返回bytes"""
+        if PYBASE64_AVAILABLE:
+            return pybase64.b64encode(data)
+        return binascii.b2a_base64(data, newline=False)
+
+    def clear_caches(self):
+        """清空OCR结果和字段解析结果缓存（修改字段配置或切换OCR服务后调用）"""
+        with self._cache_lock:
+            self._ocr_cache.clear()
+            self._parse_cache.clear()
+
+    def test_ocr_connection(self, deep: bool = True) -> bool:
+        """
+        测试OCR服务连接
+
+        Args:
+            deep: 为True时发送HTTP请求确认服务可用，为False时只检查端口是否在监听
+        """
+        if not deep:
+            try:
+                with socket.create_connection((self.ocr_host, self.ocr_port), timeout=OCR_PORT_PROBE_TIMEOUT):
+                    return True
+            except OSError as e:
+                self.logger.error(f"OCR服务连接失败: {e}")
+                return False
+
         try:
             # 先尝试访问根路径检查服务是否运行
-            response = self.session.get(f"{self.ocr_url}/", timeout=5)
+            response = self.session.get(f"{self.ocr_url}/", timeout=OCR_HTTP_PROBE_TIMEOUT)
             if response.status_code == 200:
                 return True
 
             # 如果根路径不可访问，尝试OCR接口（返回405也是正常的）
-            response = self.session.post(f"{self.ocr_url}/api/ocr", timeout=5)
+            response = self.session.post(f"{self.ocr_url}/api/ocr", timeout=OCR_HTTP_PROBE_TIMEOUT)
             return response.status_code in [200, 405]  # 405表示服务运行但不接受空请求
         except Exception as e:
             self.logger.error(f"OCR服务连接失败: {e}")
             return False
 
-    def recognize_image(self, image_path: str) -> Optional[Dict[str, Any]]:
+    def recognize_image(self, image_path: str, image_data: bytes = None) -> Optional[Dict[str, Any]]:
         """
         识别图片或PDF中的文字
 
         Args:
             image_path: 图片或PDF文件路径
+            image_data: 已读取的文件内容，提供时不再重复读取磁盘
 
         Returns:
             OCR识别结果
         """
-        if not os.path.exists(image_path):
+        if image_data is None and not os.path.exists(image_path):
             self.logger.error(f"文件不存在: {image_path}")
             return None
 
+        if image_data is None:
+            # 读取文件内容（PDF同样先读入内存，用于计算缓存键）
+            try:
+                with open(image_path, 'rb', buffering=FILE_READ_BUFFER_SIZE) as f:
+                    image_data = f.read()
+                self.logger.info(f"文件读取成功: {image_path}")
+            except Exception as e:
+                self.logger.error(f"文件读取失败: {e}")
+                return None
+
+        # 相同内容的文件直接返回缓存的OCR结果，跳过PDF渲染和OCR请求
+        cache_key = self._content_hash(image_data)
+        cached = self._cache_get(self._ocr_cache, cache_key)
+        if cached is not None:
+            self.logger.info(f"使用缓存的OCR结果: {image_path}")
+            return cached
+
         try:
             # 检查是否为PDF文件
             if image_path.lower().endswith('.pdf'):
                 self.logger.info(f"处理PDF文件: {image_path}")
+                result = self._recognize_pdf(image_data)
+            else:
+                # 缓存键基于原始文件内容，缩小只影响发送给OCR服务的数据
+                result = self._ocr_request(self._shrink_image(image_data))
 
-                # 检查pypdfium2是否可用
-                try:
-                    import pypdfium2 as pdfium
-                    import io
-                except ImportError as e:
-                    self.logger.error("pypdfium2库未安装，无法处理PDF文件")
-                    self.logger.info("请运行: pip install pypdfium2")
-                    return None
-
-                # 打开PDF文件
-                try:
-                    pdf = pdfium.PdfDocument(image_path)
-                    self.logger.info(f"PDF文件打开成功，共 {len(pdf)} 页")
-                except Exception as e:
-                    self.logger.error(f"PDF文件打开失败: {e}")
-                    self.logger.info("请检查PDF文件是否损坏或加密")
-                    return None
-
-                # 处理第一页（目前只支持单页PDF）
-                try:
-                    page = pdf[0]
+            if result is not None:
+                self._cache_put(self._ocr_cache, cache_key, result, OCR_CACHE_SIZE)
+            return result
 
-                    # 渲染页面为图片
-                    bitmap = page.render(
-                        scale=2.0,  # 提高分辨率以获得更好的OCR效果
-                        crop=(0, 0, 0, 0),  # 不裁剪
-                    )
+        except Exception as e:
+            self.logger.error(f"OCR识别异常: {e}")
+            return None
 
-                    # 将渲染的位图转换为PIL Image
-                    pil_image = bitmap.to_pil()
+    def _recognize_pdf(self, pdf_data: bytes) -> Optional[Dict[str, Any]]:
+        """
+        识别PDF的所有页面
 
-                    # 将PIL Image转换为二进制数据
-                    image_stream = io.BytesIO()
-                    pil_image.save(image_stream, format='PNG')
-                    image_data = image_stream.getvalue()
+        pdfium不是线程安全的，打开、渲染和关闭都持有PDFIUM_LOCK，
+        批量处理的多个线程之间也依次渲染；
+        每渲染完一页就提交OCR请求，渲染下一页的同时识别上一页。
+        """
+        # 检查pypdfium2是否可用
+        try:
+            import pypdfium2 as pdfium
+        except ImportError as e:
+            self.logger.error("pypdfium2库未安装，无法处理PDF文件")
+            self.logger.info("请运行: pip install pypdfium2")
+            return None
 
-                    self.logger.info("PDF转换为图片成功")
+        # 打开PDF文件
+        try:
+            with PDFIUM_LOCK:
+                pdf = pdfium.PdfDocument(pdf_data)
+                page_count = len(pdf)
+            self.logger.info(f"PDF文件打开成功，共 {page_count} 页")
+        except Exception as e:
+            self.logger.error(f"PDF文件打开失败: {e}")
+            self.logger.info("请检查PDF文件是否损坏或加密")
+            return None
 
-                    # 清理资源
-                    bitmap = None
-                    page = None
-                    pdf.close()
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(page_count, PDF_OCR_MAX_WORKERS))) as executor:
+                futures = []
+                for page_index in range(page_count):
+                    with PDFIUM_LOCK:
+                        page = pdf[page_index]
+                        try:
+                            page_image = self._render_pdf_page(page)
+                        finally:
+                            page.close()
+                    futures.append(executor.submit(self._ocr_request, page_image))
+
+                self.logger.info("PDF转换为图片成功")
+                page_results = [future.result() for future in futures]
+        finally:
+            with PDFIUM_LOCK:
+                pdf.close()
+
+        return self._merge_page_results(page_results)
+
+    @staticmethod
+    def _merge_page_results(page_results: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """按页码顺序合并多页的OCR结果，全部失败时返回None"""
+        results = [result for result in page_results if result]
+        if len(results) <= 1:
+            return results[0] if results else None
+
+        merged_data = []
+        for result in results:
+            data = result.get('data')
+            if isinstance(data, list):
+                merged_data.extend(data)
+            elif isinstance(data, str):
+                merged_data.append({'text': data})
+        return {'code': 100, 'data': merged_data}
+
+    def _ocr_request(self, image_data: bytes) -> Optional[Dict[str, Any]]:
+        """发送单张图片的OCR请求，成功时返回识别结果"""
+        # 将图片数据编码为base64，直接拼接成JSON请求体
+        # （base64字符无需转义，省去解码为字符串和再次序列化的两份拷贝）
+        body = b''.join((OCR_REQUEST_PREFIX, self._encode_base64(image_data), OCR_REQUEST_SUFFIX))
+
+        # 发送JSON请求
+        response = self.session.post(
+            f"{self.ocr_url}/api/ocr",
+            data=body,
+            headers={'Content-Type': 'application/json'},
+            timeout=120  # 增加到120秒，适合处理PDF和复杂图片
+        )
 
-                except Exception as e:
-                    self.logger.error(f"PDF页面渲染失败: {e}")
-                    return None
+        if response.status_code == 200:
+            result = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
+            if result.get('code') == 100:  # 成功状态码
+                return result
             else:
-                # 读取图片文件并编码为base64
-                try:
-                    with open(image_path, 'rb') as f:
-                        image_data = f.read()
-                    self.logger.info(f"图片文件读取成功: {image_path}")
-                except Exception as e:
-                    self.logger.error(f"图片文件读取失败: {e}")
-                    return None
-
-            # 将图片数据编码为base64
-            base64_data = base64.b64encode(image_data).decode('utf-8')
-
-            # 构建JSON请求
-            request_data = {
-                'base64': base64_data,
-                # 可选的OCR参数
-                'options': {
-                    'det_limit_side_len': 1024,
-                    'cls': True,
-                    'rec': True
-                }
-            }
+                self.logger.error(f"OCR识别失败: {result.get('data', '未知错误')}")
+                return None
+        else:
+            self.logger.error(f"OCR请求失败，状态码: {response.status_code}")
+            return None
 
-            # 发送JSON请求
-            response = self.session.post(
-                f"{self.ocr_url}/api/ocr",
-                json=request_data,
-                timeout=120  # 增加到120秒，适合处理PDF和复杂图片
-            )
+    @staticmethod
+    def _flatten_ocr_text(data) -> str:
+        """将umi-OCR返回的data字段展开为按行拼接的完整文本"""
+        if isinstance(data, str):
+            # umi-OCR的直接文本格式
+            return data
 
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('code') == 100:  # 成功状态码
-                    return result
-                else:
-                    self.logger.error(f"OCR识别失败: {result.get('data', '未知错误')}")
-                    return None
+        if isinstance(data, dict):
+            # 可能的嵌套字典格式
+            if 'res' in data:
+                data = data['res']
             else:
-                self.logger.error(f"OCR请求失败，状态码: {response.status_code}")
-                return None
-
-        except Exception as e:
-            self.logger.error(f"OCR识别异常: {e}")
-            return None
+                return data.get('text') or data.get('content') or ""
+
+        if not isinstance(data, list):
+            return ""
+
+        # umi-OCR的详细格式（包含text字段）
+        blocks = []
+        append = blocks.append
+        for item in data:
+            if isinstance(item, dict):
+                text = item.get('text')
+                if text is None:
+                    text = item.get('content')
+                if text is not None:
+                    append(text)
+            elif isinstance(item, str):
+                append(item)
+        return '\n'.join(blocks)
 
     def extract_invoice_fields(self, ocr_result: Dict[str, Any], field_names: List[str] = None) -> Dict[str, str]:
         """
@@ -268,36 +661,7 @@ class InvoiceOCRTool:
             return {}
 
         # 获取识别的文字内容
-        full_text = ""
-
-        if isinstance(ocr_result['data'], str):
-            # umi-OCR的直接文本格式
-            full_text = ocr_result['data']
-        elif isinstance(ocr_result['data'], list):
-            # umi-OCR的详细格式（包含text字段）
-            text_blocks = []
-            for item in ocr_result['data']:
-                if isinstance(item, dict):
-                    if 'text' in item:
-                        text_blocks.append(item['text'])
-                    elif 'content' in item:
-                        text_blocks.append(item['content'])
-                elif isinstance(item, str):
-                    text_blocks.append(item)
-            full_text = '\n'.join(text_blocks)
-        elif isinstance(ocr_result['data'], dict):
-            # 可能的嵌套字典格式
-            if 'res' in ocr_result['data']:
-                for item in ocr_result['data']['res']:
-                    if isinstance(item, dict):
-                        if 'text' in item:
-                            full_text += item['text'] + '\n'
-                        elif 'content' in item:
-                            full_text += item['content'] + '\n'
-            elif 'text' in ocr_result['data']:
-                full_text = ocr_result['data']['text']
-            elif 'content' in ocr_result['data']:
-                full_text = ocr_result['data']['content']
+        full_text = self._flatten_ocr_text(ocr_result['data'])
 
         self.logger.debug(f"OCR识别文本:\n{full_text}")
 
@@ -368,125 +732,50 @@ class InvoiceOCRTool:
             for field_name in field_names:
                 field = field_config_manager.get_field(field_name)
                 if field and field.patterns:
-                    # 使用字段配置中的正则表达式模式
-                    for pattern in field.patterns:
-                        try:
-                            match = re.search(pattern, full_text, re.IGNORECASE)
-                            if match:
-                                value = match.group(1).strip()
-                                # 使用字段配置管理器验证和清理字段值
-                                validated_value = field_config_manager.validate_field_value(field_name, value)
-                                if validated_value:
-                                    extracted_fields[field_name] = validated_value
-                                    self.logger.debug(f"传统方法提取成功: {field_name} = {validated_value}")
-                                    break  # 找到第一个匹配就停止
-                        except re.error as e:
-                            self.logger.warning(f"字段 {field_name} 的正则表达式有误: {pattern}, 错误: {e}")
+                    # 使用字段配置中的正则表达式模式（已编译并按字段缓存）
+                    for pattern in field_config_manager.compiled_patterns_for(field_name):
+                        match = pattern.search(full_text)
+                        if match:
+                            value = match.group(1).strip()
+                            # 使用字段配置管理器验证和清理字段值
+                            validated_value = field_config_manager.validate_field_value(field_name, value)
+                            if validated_value:
+                                extracted_fields[field_name] = validated_value
+                                self.logger.debug(f"传统方法提取成功: {field_name} = {validated_value}")
+                                break  # 找到第一个匹配就停止
                 else:
                     self.logger.warning(f"字段 {field_name} 没有配置或没有提取模式")
         else:
-            # 回退到硬编码的字段提取逻辑
             self.logger.warning("字段配置不可用，使用硬编码提取逻辑")
-            extracted_fields = self._extract_fields_hardcoded(full_text)
-
-        # 1. 发票号码提取
-        invoice_number_patterns = [
-            r'发票号码[:：]?\s*(\w+)',
-            r'No\.?\s*[:：]?\s*(\w+)',
-            r'Invoice\s*No\.?[:：]?\s*(\w+)',
-            r'(\d{8,12})',  # 8-12位数字
-        ]
-        for pattern in invoice_number_patterns:
-            match = re.search(pattern, full_text, re.IGNORECASE)
-            if match:
-                extracted_fields['发票号码'] = match.group(1)
-                break
-
-        # 2. 开票日期提取
-        date_patterns = [
-            r'开票日期[:：]?\s*(\d{4}[-/年]\d{1,2}[-/月]\d{1,2}日?)',
-            r'Date[:：]?\s*(\d{4}[-/]\d{1,2}[-/]\d{1,2})',
-            r'(\d{4}[-/年]\d{1,2}[-/月]\d{1,2}日?)',
-        ]
-        for pattern in date_patterns:
-            match = re.search(pattern, full_text)
-            if match:
-                extracted_fields['开票日期'] = match.group(1).replace('年', '-').replace('月', '-').replace('日', '')
-                break
-
-        # 3. 销售方名称提取
-        seller_patterns = [
-            r'销售方[:：]?\s*([^开票方购买方收款方付款方\s]{2,20})',
-            r'收款人[:：]?\s*([^开票方购买方收款方付款方\s]{2,20})',
-            r'Seller[:：]?\s*([^\n]{2,30})',
-        ]
-        for pattern in seller_patterns:
-            match = re.search(pattern, full_text)
-            if match:
-                extracted_fields['销售方名称'] = match.group(1).strip()
-                break
-
-        # 4. 购买方名称提取
-        buyer_patterns = [
-            r'购买方[:：]?\s*([^开票方购买方收款方付款方\s]{2,20})',
-            r'付款人[:：]?\s*([^开票方购买方收款方付款方\s]{2,20})',
-            r'Buyer[:：]?\s*([^\n]{2,30})',
-        ]
-        for pattern in buyer_patterns:
-            match = re.search(pattern, full_text)
-            if match:
-                extracted_fields['购买方名称'] = match.group(1).strip()
-                break
-
-        # 5. 金额提取
-        amount_patterns = [
-            r'价税合计[:：]?\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'合计金额[:：]?\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'Total[:：]?\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'￥(\d+(?:,\d{3})*(?:\.\d{2})?)',
-        ]
-        for pattern in amount_patterns:
-            match = re.search(pattern, full_text)
-            if match:
-                extracted_fields['合计金额'] = match.group(1).replace(',', '')
-                break
 
-        # 6. 税额提取
-        tax_patterns = [
-            r'税额[:：]?\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'增值税[:：]?\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'Tax[:：]?\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-        ]
-        for pattern in tax_patterns:
-            match = re.search(pattern, full_text)
-            if match:
-                extracted_fields['税额'] = match.group(1).replace(',', '')
-                break
+        # 内置的发票字段提取，匹配到的值覆盖配置模式的结果
+        extracted_fields.update(self._extract_fields_hardcoded(full_text))
 
         # 如果没有找到明确的税额，尝试计算
         if '合计金额' in extracted_fields and '税额' not in extracted_fields:
             # 尝试找到不含税金额
-            for pattern in [r'不含税金额[:：]?\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)']:
-                match = re.search(pattern, full_text)
-                if match:
-                    try:
-                        amount = float(extracted_fields['合计金额'])
-                        amount_without_tax = float(match.group(1).replace(',', ''))
-                        tax = amount - amount_without_tax
-                        extracted_fields['税额'] = f"{tax:.2f}"
-                        break
-                    except ValueError:
-                        continue
+            label_pos = full_text.find('不含税金额')
+            match = label_pos >= 0 and AMOUNT_WITHOUT_TAX_PATTERN.search(full_text, label_pos)
+            if match:
+                try:
+                    amount = float(extracted_fields['合计金额'])
+                    amount_without_tax = float(match.group(1).replace(',', ''))
+                    tax = amount - amount_without_tax
+                    extracted_fields['税额'] = f"{tax:.2f}"
+                except ValueError:
+                    pass
 
         return extracted_fields
 
-    def process_invoice(self, image_path: str, output_format: str = "json") -> Optional[Dict[str, Any]]:
+    def process_invoice(self, image_path: str, output_format: str = "json",
+                        image_data: bytes = None) -> Optional[Dict[str, Any]]:
         """
         处理发票图片
 
         Args:
             image_path: 发票图片路径
             output_format: 输出格式 (json, text)
+            image_data: 已读取的文件内容，提供时不再重复读取磁盘
 
         Returns:
             处理结果
@@ -495,7 +784,7 @@ class InvoiceOCRTool:
 
         # OCR识别
         try:
-            ocr_result = self.recognize_image(image_path)
+            ocr_result = self.recognize_image(image_path, image_data)
             if not ocr_result:
                 file_type = "PDF" if image_path.lower().endswith('.pdf') else "图片"
                 self.logger.error(f"{file_type}OCR识别失败")
@@ -506,22 +795,71 @@ class InvoiceOCRTool:
             return None
 
         # 获取OCR识别文本
-        full_text = ""
-        if isinstance(ocr_result.get('data'), str):
-            full_text = ocr_result['data']
-        elif isinstance(ocr_result.get('data'), list):
-            text_blocks = []
-            for item in ocr_result['data']:
-                if isinstance(item, dict) and 'text' in item:
-                    text_blocks.append(item['text'])
-                elif isinstance(item, str):
-                    text_blocks.append(item)
-            full_text = '\n'.join(text_blocks)
+        full_text = self._flatten_ocr_text(ocr_result.get('data'))
 
         # 提取字段并记录解析方式
+        extracted_fields, parsing_method, ai_confidence, ai_analysis = self._parse_fields(full_text)
+
+        # 创建结果对象
+        result = InvoiceResult(
+            image_path=image_path,
+            processing_time=_format_now(),
+            extracted_fields=extracted_fields,
+            ocr_result=ocr_result if output_format == "json" else None,
+            parsing_method=parsing_method,
+            ai_confidence=ai_confidence,
+            ai_analysis=ai_analysis,
+            full_text=full_text
+        )
+
+        self.logger.info("发票处理完成")
+        return result
+
+    def process_batch(self, image_paths: List[str], output_format: str = "json",
+                      max_workers: int = BATCH_MAX_WORKERS) -> List[Optional[InvoiceResult]]:
+        """
+        并发处理多张发票，所有线程共用同一个Session的连接池
+
+        Args:
+            image_paths: 发票文件路径列表
+            output_format: 输出格式 (json, text)
+            max_workers: 最大并发数
+
+        Returns:
+            与image_paths顺序一致的处理结果列表，失败的条目为None
+        """
+        max_workers = max(1, min(max_workers, OCR_POOL_SIZE))
+
+        def process_one(image_path):
+            try:
+                return self.process_invoice(image_path, output_format)
+            except Exception as e:
+                self.logger.error(f"处理发票失败 {image_path}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(process_one, image_paths))
+
+    def _parse_fields(self, full_text: str):
+        """
+        解析识别文本中的字段，相同文本直接返回缓存的解析结果
+
+        Returns:
+            (提取字段, 解析方式, AI置信度, AI原始响应)
+        """
+        field_names = tuple(field_config_manager.get_field_names()) if FIELD_CONFIG_AVAILABLE else ()
+        cache_key = (self._content_hash(full_text), self.use_ai, field_names)
+        cached = self._cache_get(self._parse_cache, cache_key)
+        if cached is not None:
+            self.logger.info("使用缓存的字段解析结果")
+            extracted_fields, parsing_method, ai_confidence, ai_analysis = cached
+            return dict(extracted_fields), parsing_method, ai_confidence, ai_analysis
+
         parsing_method = "📝 传统正则解析"
         ai_confidence = None
         ai_analysis = None
+        # AI解析失败（多为暂时性故障）时不缓存回退结果，下次仍尝试AI解析
+        cacheable = True
 
         if self.use_ai and self.ai_parser:
             self.logger.info("🤖 使用AI智能解析字段...")
@@ -548,26 +886,19 @@ class InvoiceOCRTool:
             else:
                 self.logger.warning("⚠️ AI解析失败，回退到传统解析方法")
                 extracted_fields = self.extract_fields_traditional(full_text)
+                cacheable = False
         else:
             self.logger.info("📝 使用传统正则表达式解析字段...")
             extracted_fields = self.extract_fields_traditional(full_text)
 
-        # 创建结果对象
-        result = InvoiceResult(
-            image_path=image_path,
-            processing_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            extracted_fields=extracted_fields,
-            ocr_result=ocr_result if output_format == "json" else None,
-            parsing_method=parsing_method,
-            ai_confidence=ai_confidence,
-            ai_analysis=ai_analysis,
-            full_text=full_text
-        )
+        if cacheable:
+            self._cache_put(self._parse_cache, cache_key,
+                            (dict(extracted_fields), parsing_method, ai_confidence, ai_analysis),
+                            PARSE_CACHE_SIZE)
+        return extracted_fields, parsing_method, ai_confidence, ai_analysis
 
-        self.logger.info("发票处理完成")
-        return result
-
-    def save_result(self, result: Dict[str, Any], output_path: str, format_type: str = "json"):
+    def save_result(self, result: Dict[str, Any], output_path: str, format_type: str = "json",
+                    include_raw_ocr: bool = False):
         """
         保存识别结果
 
@@ -575,11 +906,23 @@ class InvoiceOCRTool:
             result: 识别结果
             output_path: 输出文件路径
             format_type: 保存格式 (json, txt)
+            include_raw_ocr: JSON格式是否包含OCR原始结果（逐行文本和坐标，体积较大）
         """
         try:
             if format_type.lower() == "json":
+                if isinstance(result, InvoiceResult):
+                    data = result.to_dict(include_raw_ocr)
+                elif include_raw_ocr:
+                    data = result
+                else:
+                    data = {key: value for key, value in result.items() if key != 'OCR原始结果'}
+
+                if ORJSON_AVAILABLE:
+                    content = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+                else:
+                    content = json.dumps(data, ensure_ascii=False, indent=2)
                 with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, ensure_ascii=False, indent=2)
+                    f.write(content)
             elif format_type.lower() == "txt":
                 with open(output_path, 'w', encoding='utf-8') as f:
                     f.write(f"发票识别结果\n")
@@ -635,79 +978,36 @@ class InvoiceOCRTool:
         extracted_fields = {}
 
         # 1. 发票号码提取
-        invoice_number_patterns = [
-            r'发票号码[:：]?\s*(\w+)',
-            r'No\.?\s*[:：]?\s*(\w+)',
-            r'Invoice\s*No\.?[:：]?\s*(\w+)',
-            r'(\d{8,12})',  # 8-12位数字
-        ]
-        for pattern in invoice_number_patterns:
-            match = re.search(pattern, full_text, re.IGNORECASE)
-            if match:
-                extracted_fields['发票号码'] = match.group(1)
-                break
+        match = _search_by_priority(INVOICE_NUMBER_PATTERNS, INVOICE_NUMBER_RE, full_text)
+        if match:
+            extracted_fields['发票号码'] = match.group(1)
 
         # 2. 开票日期提取
-        date_patterns = [
-            r'开票日期[:：]?\s*(\d{4}[-/年]\d{1,2}[-/月]\d{1,2}日?)',
-            r'Date[:：]?\s*(\d{4}[-/]\d{1,2}[-/]\d{1,2})',
-            r'(\d{4}[-/年]\d{1,2}[-/月]\d{1,2}日?)',
-        ]
-        for pattern in date_patterns:
-            match = re.search(pattern, full_text)
-            if match:
-                date_str = match.group(1).replace('年', '-').replace('月', '-').replace('日', '')
-                extracted_fields['开票日期'] = date_str
-                break
+        match = _search_by_priority(DATE_PATTERNS, DATE_RE, full_text)
+        if match:
+            date_str = match.group(1).replace('年', '-').replace('月', '-').replace('日', '')
+            extracted_fields['开票日期'] = date_str
+
 
         # 3. 销售方名称提取
-        seller_patterns = [
-            r'销售方[:：]?\s*([^开票方购买方收款方付款方\s]{2,20})',
-            r'收款人[:：]?\s*([^开票方购买方收款方付款方\s]{2,20})',
-            r'Seller[:：]?\s*([^\n]{2,30})',
-        ]
-        for pattern in seller_patterns:
-            match = re.search(pattern, full_text)
-            if match:
-                extracted_fields['销售方名称'] = match.group(1).strip()
-                break
+        match = _search_by_priority(SELLER_PATTERNS, SELLER_RE, full_text, SELLER_KEYWORDS)
+        if match:
+            extracted_fields['销售方名称'] = match.group(1).strip()
 
         # 4. 购买方名称提取
-        buyer_patterns = [
-            r'购买方[:：]?\s*([^开票方购买方收款方付款方\s]{2,20})',
-            r'付款人[:：]?\s*([^开票方购买方收款方付款方\s]{2,20})',
-            r'Buyer[:：]?\s*([^\n]{2,30})',
-        ]
-        for pattern in buyer_patterns:
-            match = re.search(pattern, full_text)
-            if match:
-                extracted_fields['购买方名称'] = match.group(1).strip()
-                break
+        match = _search_by_priority(BUYER_PATTERNS, BUYER_RE, full_text, BUYER_KEYWORDS)
+        if match:
+            extracted_fields['购买方名称'] = match.group(1).strip()
 
         # 5. 金额提取
-        amount_patterns = [
-            r'价税合计[:：]?\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'合计金额[:：]?\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'Total[:：]?\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'￥(\d+(?:,\d{3})*(?:\.\d{2})?)',
-        ]
-        for pattern in amount_patterns:
-            match = re.search(pattern, full_text)
-            if match:
-                extracted_fields['合计金额'] = match.group(1).replace(',', '')
-                break
+        match = _search_by_priority(AMOUNT_PATTERNS, AMOUNT_RE, full_text, AMOUNT_KEYWORDS)
+        if match:
+            extracted_fields['合计金额'] = match.group(1).replace(',', '')
 
         # 6. 税额提取
-        tax_patterns = [
-            r'税额[:：]?\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'增值税[:：]?\s*￥?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'Tax[:：]?\s*￥?\s*(\d+(?:,\d{3}*(?:\.\d{2})?)',
-        ]
-        for pattern in tax_patterns:
-            match = re.search(pattern, full_text)
-            if match:
-                extracted_fields['税额'] = match.group(1).replace(',', '')
-                break
+        match = _search_by_priority(TAX_PATTERNS, TAX_RE, full_text, TAX_KEYWORDS)
+        if match:
+            extracted_fields['税额'] = match.group(1).replace(',', '')
 
         return extracted_fields
 
@@ -715,13 +1015,16 @@ class InvoiceOCRTool:
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description="专用发票OCR识别工具 - AI增强版")
-    parser.add_argument("image_path", help="发票图片文件路径")
-    parser.add_argument("-o", "--output", help="输出文件路径")
+    parser.add_argument("image_path", nargs="?", help="发票图片文件路径")
+    parser.add_argument("-o", "--output", help="输出文件路径（批量模式下为输出目录）")
+    parser.add_argument("--batch", metavar="GLOB", help="批量处理匹配通配符的文件，如 \"invoices/*.pdf\"")
+    parser.add_argument("--workers", type=int, default=BATCH_MAX_WORKERS, help="批量处理的并发数")
     parser.add_argument("-f", "--format", choices=["json", "txt", "csv", "xlsx"], default="json",
                        help="输出格式 (json/txt/csv/xlsx)")
     parser.add_argument("--host", default="127.0.0.1", help="OCR服务主机地址")
     parser.add_argument("--port", type=int, default=1224, help="OCR服务端口")
     parser.add_argument("--debug", action="store_true", help="开启调试模式")
+    parser.add_argument("--include-raw-ocr", action="store_true", help="JSON结果中包含OCR原始结果")
 
     # AI相关参数
     parser.add_argument("--no-ai", action="store_true", help="禁用AI智能解析，使用传统方法")
@@ -736,7 +1039,14 @@ def main():
         logging.getLogger().setLevel(logging.DEBUG)
 
     # 检查输入文件
-    if not os.path.exists(args.image_path):
+    if args.batch:
+        image_paths = sorted(glob.glob(args.batch))
+        if not image_paths:
+            print(f"错误: 没有匹配的文件 - {args.batch}", file=sys.stderr)
+            sys.exit(1)
+    elif not args.image_path:
+        parser.error("请指定发票图片文件路径，或使用 --batch 批量处理")
+    elif not os.path.exists(args.image_path):
         print(f"错误: 图片文件不存在 - {args.image_path}", file=sys.stderr)
         sys.exit(1)
 
@@ -753,12 +1063,45 @@ def main():
     use_ai = not args.no_ai
     ocr_tool = InvoiceOCRTool(args.host, args.port, use_ai=use_ai, ai_config=ai_config or None)
 
-    # 测试OCR服务连接
-    if not ocr_tool.test_ocr_connection():
+    # 测试OCR服务连接（只检查端口，服务异常时识别请求本身会报错）
+    if not ocr_tool.test_ocr_connection(deep=False):
         print(f"错误: 无法连接到OCR服务 {args.host}:{args.port}", file=sys.stderr)
         print("请确保umi-OCR服务已启动并运行在指定端口", file=sys.stderr)
         sys.exit(1)
 
+    if args.batch:
+        # 批量处理：多个文件并发识别，共用同一个连接池
+        output_dir = args.output or "."
+        os.makedirs(output_dir, exist_ok=True)
+
+        results = ocr_tool.process_batch(image_paths, args.format, args.workers)
+        success_count = 0
+        used_names = set()
+        for image_path, result in zip(image_paths, results):
+            if not result:
+                print(f"❌ {image_path}: 发票识别失败", file=sys.stderr)
+                continue
+
+            success_count += 1
+            # 输出文件名保留扩展名（a.jpg和a.png不会互相覆盖），
+            # 不同目录下的同名文件再追加序号
+            stem, ext = os.path.splitext(os.path.basename(image_path))
+            base_name = f"{stem}_{ext[1:]}" if ext else stem
+            output_name = f"{base_name}_result.{args.format}"
+            index = 2
+            while output_name in used_names:
+                output_name = f"{base_name}_{index}_result.{args.format}"
+                index += 1
+            used_names.add(output_name)
+            output_path = os.path.join(output_dir, output_name)
+            ocr_tool.save_result(result, output_path, args.format, args.include_raw_ocr)
+            print(f"✅ {image_path} -> {output_path}")
+
+        print(f"\n批量处理完成: 成功 {success_count}/{len(image_paths)}")
+        if success_count == 0:
+            sys.exit(1)
+        return
+
     # 处理发票
     result = ocr_tool.process_invoice(args.image_path, args.format)
 
@@ -770,12 +1113,12 @@ def main():
 
         # 保存结果
         if args.output:
-            ocr_tool.save_result(result, args.output, args.format)
+            ocr_tool.save_result(result, args.output, args.format, args.include_raw_ocr)
         else:
             # 默认输出文件名
             base_name = os.path.splitext(os.path.basename(args.image_path))[0]
             default_output = f"{base_name}_result.{args.format}"
-            ocr_tool.save_result(result, default_output, args.format)
+            ocr_tool.save_result(result, default_output, args.format, args.include_raw_ocr)
             print(f"\n结果已保存到: {default_output}")
     else:
         print("发票识别失败", file=sys.stderr)
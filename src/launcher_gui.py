@@ -8,19 +8,84 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
+import importlib
 import sys
 import os
 import time
+import socket
 import subprocess
-from datetime import datetime
+
+# 功能模块所在目录（与启动台同在src目录下），导入时加入一次搜索路径
+_SRC_PATH = os.path.dirname(os.path.abspath(__file__))
+if _SRC_PATH not in sys.path:
+    sys.path.insert(0, _SRC_PATH)
+
+# 启动台窗口大小
+WINDOW_WIDTH = 900
+WINDOW_HEIGHT = 700
+
+# 自定义颜色方案
+COLORS = {
+    'primary': '#2c3e50',
+    'success': '#27ae60',
+    'danger': '#e74c3c',
+    'dark': '#34495e'
+}
+
+# 启动台控件样式（ttk theme_settings格式）
+LAUNCHER_STYLES = {
+    # 标题样式
+    'Title.TLabel': {'configure': {'font': ('微软雅黑', 24, 'bold'),
+                                   'foreground': COLORS['primary']}},
+    'Subtitle.TLabel': {'configure': {'font': ('微软雅黑', 14),
+                                      'foreground': COLORS['dark']}},
+    'Status.TLabel': {'configure': {'font': ('微软雅黑', 10)}},
+    # 按钮样式
+    'Primary.TButton': {'configure': {'font': ('微软雅黑', 12, 'bold'),
+                                      'padding': (20, 10)}},
+    'Danger.TButton': {'configure': {'font': ('微软雅黑', 10),
+                                     'foreground': COLORS['danger']}},
+    # 状态标签样式
+    'Running.TLabel': {'configure': {'foreground': COLORS['success'],
+                                     'font': ('微软雅黑', 10, 'bold')}},
+    'Stopped.TLabel': {'configure': {'foreground': COLORS['danger'],
+                                     'font': ('微软雅黑', 10, 'bold')}},
+}
+
+# OCR服务地址
+OCR_SERVICE_ADDRESS = ('127.0.0.1', 1224)
+
+# OCR服务状态轮询间隔（毫秒）：状态刚变化时加密检测，稳定后逐步放宽
+OCR_POLL_INITIAL_INTERVAL_MS = 2000
+OCR_POLL_MIN_INTERVAL_MS = 1000
+OCR_POLL_MAX_INTERVAL_MS = 10000
+
+# 状态检测连续出错时的最长重试间隔（毫秒），超过次数上限后不再输出错误
+OCR_POLL_FAILURE_MAX_INTERVAL_MS = 60000
+OCR_POLL_MAX_LOGGED_FAILURES = 6
+
+# 检查功能模块子进程是否退出的间隔（毫秒）
+MODULE_POLL_INTERVAL_MS = 1000
+
+# 端口探测超时（秒）：本机服务要么立即接受要么拒绝连接，未运行时用很短的超时；
+# 运行中的服务可能正忙于识别，放宽超时以免误判为已停止
+OCR_PROBE_TIMEOUT = 0.3
+OCR_PROBE_TIMEOUT_IDLE = 0.05
+
+# 两次端口探测的最小间隔（秒），间隔内直接沿用上次结果
+OCR_PROBE_MIN_GAP = 0.5
+
 
 class LauncherGUI:
     """专业启动工具GUI界面"""
 
     def __init__(self):
         self.root = tk.Tk()
+        # 界面构建完成前隐藏窗口并设为全透明，避免逐个控件布局时的闪烁
+        self._set_window_alpha(0.0)
+        self.root.withdraw()
         self.root.title("发票OCR识别工具 - 专业启动台")
-        self.root.geometry("900x700")
+        self.root.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")
         self.root.minsize(800, 600)
 
         # 设置窗口属性
@@ -33,10 +98,26 @@ class LauncherGUI:
         self.gui_instance = None
         self.field_config_instance = None
         self.ocr_service_running = False
+        self._ocr_status_checked = False
+        self._poll_interval_ms = OCR_POLL_INITIAL_INTERVAL_MS
+        self._consecutive_failures = 0
+        self._last_probe_ts = 0.0
+
+        # OCR服务检测器，首次使用时导入
+        self._ocr_detector = None
+
+        # 各功能模块卡片的状态标签和按钮，按模块名索引
+        self._modules = {}
+
+        # 上次显示的时间文本
+        self._last_time_str = None
 
         # 创建界面
         self.create_widgets()
 
+        # 后台预先导入OCR服务检测器，首次点击"启动OCR服务"时无需等待导入
+        threading.Thread(target=self._warm_imports, daemon=True).start()
+
         # 启动状态检查
         self.start_status_monitoring()
 
@@ -45,51 +126,8 @@ class LauncherGUI:
         try:
             style = ttk.Style()
             style.theme_use('clam')
-
-            # 自定义颜色方案
-            colors = {
-                'primary': '#2c3e50',
-                'secondary': '#3498db',
-                'success': '#27ae60',
-                'warning': '#f39c12',
-                'danger': '#e74c3c',
-                'light': '#ecf0f1',
-                'dark': '#34495e'
-            }
-
-            # 标题样式
-            style.configure('Title.TLabel',
-                          font=('微软雅黑', 24, 'bold'),
-                          foreground=colors['primary'])
-
-            style.configure('Subtitle.TLabel',
-                          font=('微软雅黑', 14),
-                          foreground=colors['dark'])
-
-            style.configure('Status.TLabel',
-                          font=('微软雅黑', 10))
-
-            # 按钮样式
-            style.configure('Primary.TButton',
-                          font=('微软雅黑', 12, 'bold'),
-                          padding=(20, 10))
-
-            style.configure('Success.TButton',
-                          font=('微软雅黑', 10),
-                          foreground=colors['success'])
-
-            style.configure('Danger.TButton',
-                          font=('微软雅黑', 10),
-                          foreground=colors['danger'])
-
-            # 状态标签样式
-            style.configure('Running.TLabel',
-                          foreground=colors['success'],
-                          font=('微软雅黑', 10, 'bold'))
-
-            style.configure('Stopped.TLabel',
-                          foreground=colors['danger'],
-                          font=('微软雅黑', 10, 'bold'))
+            # 所有自定义样式通过一次theme_settings调用设置
+            style.theme_settings('clam', LAUNCHER_STYLES)
 
         except Exception:
             # 如果样式设置失败，使用默认样式
@@ -163,6 +201,7 @@ class LauncherGUI:
         self.time_label.grid(row=1, column=1, sticky=tk.W, padx=(20, 0))
 
         # 更新时间显示
+        self.root.bind('<Map>', self._on_root_map)
         self.update_time_display()
 
     def create_module_controls(self, parent):
@@ -177,7 +216,7 @@ class LauncherGUI:
                                row=0,
                                title="📷 发票OCR识别",
                                description="智能识别发票信息，支持AI增强解析",
-                               status_var="gui_instance",
+                               module_name="gui",
                                start_cmd=self.start_gui,
                                stop_cmd=self.stop_gui)
 
@@ -186,11 +225,11 @@ class LauncherGUI:
                                row=1,
                                title="⚙️ 字段配置管理器",
                                description="自定义配置识别字段，灵活适配业务需求",
-                               status_var="field_config_instance",
+                               module_name="field_config",
                                start_cmd=self.start_field_config,
                                stop_cmd=self.stop_field_config)
 
-    def create_module_card(self, parent, row, title, description, status_var, start_cmd, stop_cmd):
+    def create_module_card(self, parent, row, title, description, module_name, start_cmd, stop_cmd):
         """创建功能模块卡片"""
         # 模块卡片容器
         card_frame = ttk.Frame(parent)
@@ -234,9 +273,7 @@ class LauncherGUI:
         separator.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(15, 0))
 
         # 保存控件引用
-        setattr(self, f"{status_var}_status_label", status_label)
-        setattr(self, f"{status_var}_start_btn", start_btn)
-        setattr(self, f"{status_var}_stop_btn", stop_btn)
+        self._modules[module_name] = {'label': status_label, 'start': start_btn, 'stop': stop_btn}
 
     def create_footer(self, parent):
         """创建底部信息区域"""
@@ -258,44 +295,80 @@ class LauncherGUI:
 
     def update_time_display(self):
         """更新时间显示"""
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.time_label.configure(text=current_time)
-        # 每秒更新一次时间
-        self.root.after(1000, self.update_time_display)
+        now = time.time()
+        # 窗口最小化或隐藏时不刷新，恢复显示时由<Map>事件立即刷新
+        if self.root.state() not in ('iconic', 'withdrawn'):
+            self._render_time(now)
+        # 对齐到下一个整秒更新，避免累积漂移
+        delay = int((1.0 - now % 1) * 1000) + 5
+        self.root.after(delay, self.update_time_display)
+
+    def _render_time(self, now):
+        """显示指定时刻，文本未变化时不重新设置标签"""
+        current_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        if current_time != self._last_time_str:
+            self._last_time_str = current_time
+            self.time_label.configure(text=current_time)
+
+    def _on_root_map(self, event):
+        """窗口恢复显示时立即刷新时间"""
+        # 子控件的<Map>事件也会传到根窗口的绑定上，只处理根窗口本身
+        if event.widget is self.root:
+            self._render_time(time.time())
+
+    def _warm_imports(self):
+        """预先导入启动OCR服务时用到的模块"""
+        try:
+            from ocr_service_detector import ocr_detector
+            self._ocr_detector = ocr_detector
+        except Exception:
+            # 导入失败时保持原状，点击按钮时再提示
+            pass
 
     def start_status_monitoring(self):
-        """启动状态监控"""
-        def check_services():
-            while True:
-                try:
-                    # 检查OCR服务状态
-                    self.check_ocr_service_status()
-                    time.sleep(5)  # 每5秒检查一次
-                except Exception as e:
-                    print(f"状态监控异常: {e}")
-                    time.sleep(10)
-
-        # 在后台线程中启动监控
-        monitor_thread = threading.Thread(target=check_services, daemon=True)
-        monitor_thread.start()
+        """启动状态监控（在主线程中用after调度，不占用后台线程）"""
+        self.root.after(0, self._poll_ocr_once)
 
-    def check_ocr_service_status(self):
-        """检查OCR服务状态"""
+    def _poll_ocr_once(self):
+        """检测一次OCR服务状态，并按状态是否变化调整下次检测间隔"""
         try:
-            import requests
-            response = requests.get("http://127.0.0.1:1224", timeout=3)
-            if response.status_code == 200:
-                if not self.ocr_service_running:
-                    self.root.after(0, self.update_ocr_status, True)
-                    self.ocr_service_running = True
+            running = self.check_ocr_service_status()
+            self._consecutive_failures = 0
+            if running != self.ocr_service_running or not self._ocr_status_checked:
+                self.ocr_service_running = running
+                self._ocr_status_checked = True
+                self.update_ocr_status(running)
+                self._poll_interval_ms = OCR_POLL_MIN_INTERVAL_MS
             else:
-                if self.ocr_service_running:
-                    self.root.after(0, self.update_ocr_status, False)
-                    self.ocr_service_running = False
-        except:
-            if self.ocr_service_running:
-                self.root.after(0, self.update_ocr_status, False)
-                self.ocr_service_running = False
+                self._poll_interval_ms = min(self._poll_interval_ms * 2, OCR_POLL_MAX_INTERVAL_MS)
+        except Exception as e:
+            # 连续出错时按指数退避，避免在异常环境中持续刷屏和唤醒
+            self._consecutive_failures += 1
+            if self._consecutive_failures <= OCR_POLL_MAX_LOGGED_FAILURES:
+                print(f"状态监控异常: {e}")
+            self._poll_interval_ms = min(OCR_POLL_FAILURE_MAX_INTERVAL_MS,
+                                         1000 * 2 ** min(self._consecutive_failures,
+                                                         OCR_POLL_MAX_LOGGED_FAILURES))
+
+        self.root.after(self._poll_interval_ms, self._poll_ocr_once)
+
+    def check_ocr_service_status(self):
+        """检查OCR服务状态（只探测端口是否可连接）"""
+        now = time.monotonic()
+        if now - self._last_probe_ts < OCR_PROBE_MIN_GAP:
+            return bool(self.ocr_service_running)
+        self._last_probe_ts = now
+
+        # 地址是IPv4字面量，直接建立IPv4连接，不经过getaddrinfo解析
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(OCR_PROBE_TIMEOUT if self.ocr_service_running else OCR_PROBE_TIMEOUT_IDLE)
+            sock.connect(OCR_SERVICE_ADDRESS)
+            return True
+        except OSError:
+            return False
+        finally:
+            sock.close()
 
     def update_ocr_status(self, running):
         """更新OCR服务状态显示"""
@@ -318,11 +391,14 @@ class LauncherGUI:
     def start_ocr_service(self):
         """启动OCR服务"""
         try:
-            # 尝试使用OCR服务检测器
-            from ocr_service_detector import ocr_detector
-
-            # 检查服务是否已在运行
-            if ocr_detector.is_ocr_service_running():
+            # 尝试使用OCR服务检测器（首次使用时导入并缓存）
+            if self._ocr_detector is None:
+                from ocr_service_detector import ocr_detector
+                self._ocr_detector = ocr_detector
+            ocr_detector = self._ocr_detector
+
+            # 检查服务是否已在运行（端口探测，不发送HTTP请求）
+            if self.check_ocr_service_status():
                 messagebox.showinfo("提示", "OCR服务已在运行中")
                 return
 
@@ -334,20 +410,23 @@ class LauncherGUI:
             if service:
                 ocr_service_path, service_type = service
 
-                # 查找可执行文件
-                main_script = os.path.join(ocr_service_path, "main.py")
-                exe_file = os.path.join(ocr_service_path, "Umi-OCR.exe")
-
-                if os.path.exists(exe_file):
-                    command = [exe_file]
-                elif os.path.exists(main_script):
-                    command = [sys.executable, main_script]
-                else:
+                # 查找可执行文件（与识别界面共用同一查找逻辑，文件名不区分大小写）
+                from ocr_service_detector import find_ocr_entry
+                entry = find_ocr_entry(ocr_service_path)
+                if not entry:
                     messagebox.showerror("错误", f"未找到OCR服务可执行文件:\n{ocr_service_path}")
                     return
+                command = entry[0]
 
-                # 启动服务
-                subprocess.Popen(command, cwd=ocr_service_path)
+                # 启动服务：与启动台分离，不继承句柄和标准输入输出，启动台可独立退出
+                if sys.platform == 'win32':
+                    detach_options = {'creationflags': subprocess.DETACHED_PROCESS
+                                      | subprocess.CREATE_NEW_PROCESS_GROUP}
+                else:
+                    detach_options = {'start_new_session': True}
+                subprocess.Popen(command, cwd=ocr_service_path, close_fds=True,
+                                 stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.DEVNULL, **detach_options)
                 messagebox.showinfo("成功", "OCR服务启动中...\n请等待几秒后刷新状态")
             else:
                 messagebox.showerror("错误", "未找到OCR服务安装\n请手动启动OCR服务")
@@ -361,118 +440,121 @@ class LauncherGUI:
         except Exception as e:
             messagebox.showerror("错误", f"启动OCR服务失败: {str(e)}")
 
-    def start_gui(self):
-        """启动发票OCR识别GUI"""
-        if self.gui_instance is not None:
-            messagebox.showwarning("提示", "发票OCR识别界面已在运行中")
+    def _ui_error(self, title, message):
+        """在主线程中显示错误对话框（Tk不是线程安全的，后台线程不能直接弹窗）"""
+        self.root.after(0, lambda: messagebox.showerror(title, message))
+
+    def _launch_module(self, attr, module_name, import_path, class_name, friendly):
+        """
+        在独立进程中运行功能模块界面
+
+        每个界面拥有自己的进程和Tk解释器，不再与启动台共用主循环和GIL；
+        启动子进程不会阻塞，无需为每次点击创建线程，进程退出由after定时检查
+        """
+        if getattr(sys, 'frozen', False):
+            # 打包后的程序无法通过解释器启动子进程，仍在当前进程的后台线程中运行
+            threading.Thread(target=self._run_module_in_process,
+                             args=(attr, module_name, import_path, class_name, friendly),
+                             daemon=True).start()
             return
 
-        def start_gui_thread():
-            try:
-                # 添加src目录到路径
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                src_path = os.path.join(current_dir, 'src')
-                if src_path not in sys.path:
-                    sys.path.insert(0, src_path)
+        try:
+            # 子进程通过PYTHONPATH找到src目录下的模块，工作目录保持不变（配置文件使用相对路径）
+            env = dict(os.environ)
+            env['PYTHONPATH'] = os.pathsep.join(filter(None, [_SRC_PATH, env.get('PYTHONPATH')]))
+            process = subprocess.Popen(
+                [sys.executable, '-c', f'from {import_path} import {class_name}; {class_name}().run()'],
+                env=env, close_fds=True, stdin=subprocess.DEVNULL)
+        except Exception as e:
+            messagebox.showerror("错误", f"启动{friendly}失败: {str(e)}")
+            return
 
-                # 导入并启动GUI
-                from invoice_gui import InvoiceOCRGUI
+        # 标记实例运行
+        setattr(self, attr, process)
+        self.update_module_status(module_name, True)
+        self.root.after(MODULE_POLL_INTERVAL_MS, self._watch_module, attr, module_name, process, friendly)
 
-                # 标记实例运行
-                self.gui_instance = True
-                self.root.after(0, self.update_module_status, 'gui', True)
+    def _watch_module(self, attr, module_name, process, friendly):
+        """检查功能模块进程是否已退出，退出后重置状态"""
+        returncode = process.poll()
+        if returncode is None:
+            self.root.after(MODULE_POLL_INTERVAL_MS, self._watch_module, attr, module_name, process, friendly)
+            return
 
-                # 创建并运行GUI
-                app = InvoiceOCRGUI()
-                app.run()
+        # 用户点击停止或已重新启动时实例已被替换，不再处理
+        if getattr(self, attr) is not process:
+            return
 
-            except Exception as e:
-                messagebox.showerror("错误", f"启动发票OCR识别界面失败: {str(e)}")
-            finally:
-                # 重置实例状态
-                self.gui_instance = None
-                self.root.after(0, self.update_module_status, 'gui', False)
+        setattr(self, attr, None)
+        self.update_module_status(module_name, False)
+        if returncode != 0:
+            messagebox.showerror("错误", f"{friendly}异常退出（退出码: {returncode}）")
 
-        # 在新线程中启动GUI
-        gui_thread = threading.Thread(target=start_gui_thread, daemon=True)
-        gui_thread.start()
+    def _run_module_in_process(self, attr, module_name, import_path, class_name, friendly):
+        """在后台线程中导入并运行功能模块界面（打包环境使用）"""
+        try:
+            cls = getattr(importlib.import_module(import_path), class_name)
 
-    def stop_gui(self):
-        """停止发票OCR识别GUI"""
-        if self.gui_instance is None:
-            return
+            # 标记实例运行
+            setattr(self, attr, True)
+            self.root.after(0, self.update_module_status, module_name, True)
 
-        # 这里可以添加优雅关闭的逻辑
-        # 目前只是重置状态
-        self.gui_instance = None
-        self.update_module_status('gui', False)
+            cls().run()
 
-    def start_field_config(self):
-        """启动字段配置管理器"""
-        if self.field_config_instance is not None:
-            messagebox.showwarning("提示", "字段配置管理器已在运行中")
+        except Exception as e:
+            self._ui_error("错误", f"启动{friendly}失败: {str(e)}")
+        finally:
+            # 重置实例状态
+            setattr(self, attr, None)
+            self.root.after(0, self.update_module_status, module_name, False)
+
+    def _stop_module(self, attr, module_name):
+        """停止功能模块：结束其进程并重置状态"""
+        instance = getattr(self, attr)
+        if instance is None:
             return
 
-        def start_config_thread():
-            try:
-                # 添加src目录到路径
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                src_path = os.path.join(current_dir, 'src')
-                if src_path not in sys.path:
-                    sys.path.insert(0, src_path)
+        setattr(self, attr, None)
+        if isinstance(instance, subprocess.Popen):
+            instance.terminate()
+        self.update_module_status(module_name, False)
 
-                # 导入并启动配置管理器
-                from field_config_gui import FieldConfigGUI
+    def start_gui(self):
+        """启动发票OCR识别GUI"""
+        if self.gui_instance is not None:
+            messagebox.showwarning("提示", "发票OCR识别界面已在运行中")
+            return
 
-                # 标记实例运行
-                self.field_config_instance = True
-                self.root.after(0, self.update_module_status, 'field_config', True)
+        self._launch_module('gui_instance', 'gui', 'invoice_gui', 'InvoiceOCRGUI', '发票OCR识别界面')
 
-                # 创建并运行配置管理器
-                app = FieldConfigGUI()
-                app.run()
+    def stop_gui(self):
+        """停止发票OCR识别GUI"""
+        self._stop_module('gui_instance', 'gui')
 
-            except Exception as e:
-                messagebox.showerror("错误", f"启动字段配置管理器失败: {str(e)}")
-            finally:
-                # 重置实例状态
-                self.field_config_instance = None
-                self.root.after(0, self.update_module_status, 'field_config', False)
+    def start_field_config(self):
+        """启动字段配置管理器"""
+        if self.field_config_instance is not None:
+            messagebox.showwarning("提示", "字段配置管理器已在运行中")
+            return
 
-        # 在新线程中启动配置管理器
-        config_thread = threading.Thread(target=start_config_thread, daemon=True)
-        config_thread.start()
+        self._launch_module('field_config_instance', 'field_config', 'field_config_gui',
+                            'FieldConfigGUI', '字段配置管理器')
 
     def stop_field_config(self):
         """停止字段配置管理器"""
-        if self.field_config_instance is None:
-            return
-
-        # 这里可以添加优雅关闭的逻辑
-        self.field_config_instance = None
-        self.update_module_status('field_config', False)
+        self._stop_module('field_config_instance', 'field_config')
 
     def update_module_status(self, module_name, running):
         """更新模块状态显示"""
-        if module_name == 'gui':
-            if running:
-                self.gui_instance_status_label.configure(text="● 运行中", style='Running.TLabel')
-                self.gui_instance_start_btn.configure(state='disabled')
-                self.gui_instance_stop_btn.configure(state='normal')
-            else:
-                self.gui_instance_status_label.configure(text="● 未运行", style='Stopped.TLabel')
-                self.gui_instance_start_btn.configure(state='normal')
-                self.gui_instance_stop_btn.configure(state='disabled')
-
-        elif module_name == 'field_config':
-            if running:
-                self.field_config_instance_status_label.configure(text="● 运行中", style='Running.TLabel')
-                self.field_config_instance_start_btn.configure(state='disabled')
-                self.field_config_instance_stop_btn.configure(state='normal')
-            else:
-                self.field_config_instance_status_label.configure(text="● 未运行", style='Stopped.TLabel')
-                self.field_config_instance_start_btn.configure(state='normal')
-                self.field_config_instance_stop_btn.configure(state='disabled')
+        controls = self._modules[module_name]
+        if running:
+            controls['label'].configure(text="● 运行中", style='Running.TLabel')
+            controls['start'].configure(state='disabled')
+            controls['stop'].configure(state='normal')
+        else:
+            controls['label'].configure(text="● 未运行", style='Stopped.TLabel')
+            controls['start'].configure(state='normal')
+            controls['stop'].configure(state='disabled')
 
     def exit_application(self):
         """退出应用程序"""
@@ -496,15 +578,25 @@ class LauncherGUI:
         # 关闭启动台
         self.root.destroy()
 
+    def _set_window_alpha(self, alpha):
+        """设置窗口透明度（部分窗口管理器不支持，忽略失败）"""
+        try:
+            self.root.attributes('-alpha', alpha)
+        except tk.TclError:
+            pass
+
     def run(self):
         """运行启动台"""
-        # 居中显示窗口
+        # 一次性完成布局，居中后再显示窗口
+        # 窗口隐藏时winfo_width无效，使用布局计算出的需求大小（不小于设定的窗口大小）
         self.root.update_idletasks()
-        width = self.root.winfo_width()
-        height = self.root.winfo_height()
+        width = max(self.root.winfo_reqwidth(), WINDOW_WIDTH)
+        height = max(self.root.winfo_reqheight(), WINDOW_HEIGHT)
         x = (self.root.winfo_screenwidth() // 2) - (width // 2)
         y = (self.root.winfo_screenheight() // 2) - (height // 2)
         self.root.geometry(f'{width}x{height}+{x}+{y}')
+        self.root.deiconify()
+        self._set_window_alpha(1.0)
 
         # 运行主循环
         self.root.mainloop()
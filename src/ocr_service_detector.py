@@ -11,6 +11,50 @@ import json
 from pathlib import Path
 from typing import List, Optional, Tuple
 
+# 完整搜索未找到服务后，在此时间内（秒）不再重复全盘搜索
+FULL_SCAN_NEGATIVE_TTL = 24 * 60 * 60
+
+# 探测OCR服务用的共享Session，首次使用时创建
+_probe_session = None
+
+
+def _get_probe_session():
+    """获取共享的HTTP Session，反复探测时复用keep-alive连接"""
+    global _probe_session
+    if _probe_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        # 只访问本机地址，不读取系统代理设置：Windows下判断代理例外时会对主机名做反向DNS查询，
+        # 在DNS配置异常的机器上会让每次探测卡住数秒
+        session.trust_env = False
+        session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+        _probe_session = session
+    return _probe_session
+
+
+def find_ocr_entry(service_path: str) -> Optional[Tuple[List[str], str]]:
+    """
+    读取一次目录，查找OCR服务的入口文件（可执行文件优先）
+
+    Returns:
+        (启动命令, 类型)，未找到返回None
+    """
+    try:
+        with os.scandir(service_path) as entries:
+            # Windows文件名不区分大小写，统一按小写比较，启动时使用实际文件名
+            names = {entry.name.lower(): entry.path for entry in entries if entry.is_file()}
+    except OSError:
+        return None
+
+    if "umi-ocr.exe" in names:
+        return [names["umi-ocr.exe"]], "可执行文件"
+    if "main.py" in names:
+        return [sys.executable, names["main.py"]], "Python脚本"
+    return None
+
+
 class OCRServiceDetector:
     """OCR服务路径检测器"""
 
@@ -41,21 +85,41 @@ class OCRServiceDetector:
         self.config_file = os.path.join(os.path.dirname(__file__), "..", "config", "ocr_paths.json")
         self.saved_paths = self.load_saved_paths()
 
+        # 上次完整搜索未找到服务的时间，在有效期内不再重复全盘搜索
+        self._full_scan_empty_at = self._load_config().get('full_scan_empty_at', 0)
+
         # 缓存检测结果，避免重复搜索
         self._cached_services = None
         self._cache_timestamp = 0
         self._cache_ttl = 30  # 缓存30秒
+        self._cached_full_scan = False
 
-    def load_saved_paths(self) -> List[str]:
-        """加载保存的路径"""
+    def _load_config(self) -> dict:
+        """读取配置文件"""
         try:
             if os.path.exists(self.config_file):
                 with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    return config.get('ocr_paths', [])
+                    return json.load(f)
         except Exception:
             pass
-        return []
+        return {}
+
+    def _save_config(self):
+        """写入配置文件（保存的路径和完整搜索的失败时间）"""
+        config = {'ocr_paths': self.saved_paths}
+        if self._full_scan_empty_at:
+            config['full_scan_empty_at'] = self._full_scan_empty_at
+
+        try:
+            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
+            with open(self.config_file, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=2, ensure_ascii=False)
+        except Exception:
+            pass
+
+    def load_saved_paths(self) -> List[str]:
+        """加载保存的路径"""
+        return self._load_config().get('ocr_paths', [])
 
     def save_path(self, path: str):
         """保存有效的OCR路径"""
@@ -63,13 +127,9 @@ class OCRServiceDetector:
             self.saved_paths.insert(0, path)  # 插入到最前面
             # 只保留最近10个路径
             self.saved_paths = self.saved_paths[:10]
-
-            try:
-                os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-                with open(self.config_file, 'w', encoding='utf-8') as f:
-                    json.dump({'ocr_paths': self.saved_paths}, f, indent=2, ensure_ascii=False)
-            except Exception:
-                pass
+            # 已有可用路径，之前的搜索失败记录作废
+            self._full_scan_empty_at = 0
+            self._save_config()
 
     def find_ocr_services(self, quick_mode: bool = True) -> List[Tuple[str, str]]:
         """查找所有可用的OCR服务
@@ -82,10 +142,11 @@ class OCRServiceDetector:
         """
         import time
 
-        # 检查缓存
+        # 检查缓存（快速模式的结果不能代替完整搜索）
         current_time = time.time()
         if (self._cached_services is not None and
-            current_time - self._cache_timestamp < self._cache_ttl):
+            current_time - self._cache_timestamp < self._cache_ttl and
+            (quick_mode or self._cached_full_scan)):
             return self._cached_services
 
         found_services = []
@@ -109,8 +170,8 @@ class OCRServiceDetector:
             if service_info:
                 found_services.append(service_info)
 
-        # 只在非快速模式下进行系统搜索
-        if not quick_mode:
+        # 只在非快速模式下进行系统搜索，最近一次完整搜索失败的有效期内跳过
+        if not quick_mode and current_time - self._full_scan_empty_at >= FULL_SCAN_NEGATIVE_TTL:
             system_found = self._search_system()
             for path, service_type in system_found:
                 # 避免重复
@@ -118,9 +179,18 @@ class OCRServiceDetector:
                     continue
                 found_services.append((path, service_type))
 
+            if system_found:
+                # 保存搜索结果，下次启动时快速检测即可命中
+                for path, _ in reversed(system_found):
+                    self.save_path(path)
+            elif not found_services:
+                self._full_scan_empty_at = current_time
+                self._save_config()
+
         # 更新缓存
         self._cached_services = found_services
         self._cache_timestamp = current_time
+        self._cached_full_scan = not quick_mode
 
         return found_services
 
@@ -130,25 +200,19 @@ class OCRServiceDetector:
             return None
 
         # 查找可执行文件
-        exe_file = os.path.join(path, "Umi-OCR.exe")
-        main_script = os.path.join(path, "main.py")
-
-        if os.path.exists(exe_file):
-            return (path, "可执行文件")
-        elif os.path.exists(main_script):
-            return (path, "Python脚本")
+        entry = find_ocr_entry(path)
+        if entry:
+            return (path, entry[1])
 
         # 检查是否有umi-ocr相关的子目录
         try:
-            for item in os.listdir(path):
-                item_path = os.path.join(path, item)
-                if os.path.isdir(item_path):
-                    # 检查子目录中是否有可执行文件
-                    sub_exe = os.path.join(item_path, "Umi-OCR.exe")
-                    sub_main = os.path.join(item_path, "main.py")
-
-                    if os.path.exists(sub_exe) or os.path.exists(sub_main):
-                        return (item_path, "可执行文件" if os.path.exists(sub_exe) else "Python脚本")
+            with os.scandir(path) as items:
+                for item in items:
+                    if item.is_dir():
+                        # 检查子目录中是否有可执行文件
+                        entry = find_ocr_entry(item.path)
+                        if entry:
+                            return (item.path, entry[1])
         except Exception:
             pass
 
@@ -219,16 +283,25 @@ class OCRServiceDetector:
                 # 更新缓存
                 self._cached_services = [service_info]
                 self._cache_timestamp = current_time
+                self._cached_full_scan = False
                 return service_info
 
         # 如果保存的路径都无效，清除缓存并返回None
         self._cached_services = None
         return None
 
+    def is_full_scan_suppressed(self) -> bool:
+        """最近一次完整搜索未找到服务，当前仍在跳过全盘搜索的有效期内"""
+        import time
+        return time.time() - self._full_scan_empty_at < FULL_SCAN_NEGATIVE_TTL
+
     def invalidate_cache(self):
         """清除缓存，强制重新搜索"""
         self._cached_services = None
         self._cache_timestamp = 0
+        if self._full_scan_empty_at:
+            self._full_scan_empty_at = 0
+            self._save_config()
 
     def manual_add_path(self, path: str) -> bool:
         """手动添加路径"""
@@ -242,8 +315,7 @@ class OCRServiceDetector:
     def is_ocr_service_running(self, port: int = 1224) -> bool:
         """检查OCR服务是否正在运行"""
         try:
-            import requests
-            response = requests.get(f"http://127.0.0.1:{port}", timeout=3)
+            response = _get_probe_session().get(f"http://127.0.0.1:{port}", timeout=3)
             return response.status_code == 200
         except Exception:
             return False
@@ -6,6 +6,7 @@
 
 import unittest
 import json
+import base64
 import os
 from unittest.mock import Mock, patch, mock_open
 from invoice_ocr_tool import InvoiceOCRTool
@@ -39,6 +40,15 @@ class TestInvoiceOCRTool(unittest.TestCase):
         mock_get.side_effect = Exception("Connection failed")
         self.assertFalse(self.ocr_tool.test_ocr_connection())
 
+    @patch('socket.create_connection')
+    @patch('requests.Session.get')
+    def test_ocr_connection_port_only(self, mock_get, mock_connect):
+        """测试OCR服务连接 - 只检查端口，不发送HTTP请求"""
+        mock_connect.side_effect = ConnectionRefusedError()
+        self.assertFalse(self.ocr_tool.test_ocr_connection(deep=False))
+        mock_connect.assert_called_once_with(("127.0.0.1", 1224), timeout=0.5)
+        mock_get.assert_not_called()
+
     def test_extract_invoice_fields_with_data(self):
         """测试字段提取功能 - 有数据"""
         # 模拟OCR结果
@@ -62,6 +72,12 @@ class TestInvoiceOCRTool(unittest.TestCase):
         self.assertEqual(extracted.get('合计金额'), '11700.00')
         self.assertEqual(extracted.get('税额'), '1700.00')
 
+    def test_extract_fields_hardcoded_tax(self):
+        """测试硬编码提取逻辑 - 英文税额"""
+        extracted = self.ocr_tool._extract_fields_hardcoded("Total: 1,170.00\nTax: 170.00")
+        self.assertEqual(extracted.get('合计金额'), '1170.00')
+        self.assertEqual(extracted.get('税额'), '170.00')
+
     def test_extract_invoice_fields_empty_data(self):
         """测试字段提取功能 - 空数据"""
         empty_result = {}
@@ -91,6 +107,39 @@ class TestInvoiceOCRTool(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertIn("data", result)
 
+    @patch('requests.Session.post')
+    def test_recognize_image_with_bytes(self, mock_post):
+        """测试图片识别 - 直接传入文件内容，不读取磁盘"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "code": 100,
+            "data": [{"text": "测试识别结果"}]
+        }
+        mock_response.content = json.dumps(mock_response.json.return_value).encode('utf-8')
+        mock_post.return_value = mock_response
+
+        result = self.ocr_tool.recognize_image("not_on_disk.jpg", image_data=b'fake_image_data')
+
+        self.assertIsNotNone(result)
+        request_data = json.loads(mock_post.call_args[1]['data'])
+        self.assertEqual(base64.b64decode(request_data['base64']), b'fake_image_data')
+        self.assertTrue(request_data['options']['cls'])
+
+    def test_shrink_image(self):
+        """测试大图片发送前缩小"""
+        from PIL import Image
+        import io
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (4000, 3000), 'white').save(buffer, format='PNG')
+        shrunk = InvoiceOCRTool._shrink_image(buffer.getvalue())
+
+        with Image.open(io.BytesIO(shrunk)) as im:
+            self.assertEqual(im.format, 'JPEG')
+            self.assertEqual(max(im.size), 1600)
+        self.assertEqual(InvoiceOCRTool._shrink_image(b'fake_image_data'), b'fake_image_data')
+
     def test_recognize_image_file_not_exists(self):
         """测试图片识别 - 文件不存在"""
         result = self.ocr_tool.recognize_image("nonexistent_file.jpg")
@@ -155,6 +204,67 @@ class TestInvoiceOCRTool(unittest.TestCase):
             self.assertIn("提取字段", result)
             self.assertEqual(result["提取字段"]["发票号码"], "12345678")
 
+    def test_process_invoice_reuses_parse_cache(self):
+        """测试处理发票 - 相同识别文本只解析一次"""
+        mock_ocr_result = {"data": [{"text": "发票号码：12345678"}]}
+
+        with patch.object(self.ocr_tool, 'recognize_image', return_value=mock_ocr_result), \
+                patch.object(self.ocr_tool, 'extract_fields_traditional',
+                             return_value={'发票号码': '12345678'}) as mock_extract:
+            self.ocr_tool.use_ai = False
+            first = self.ocr_tool.process_invoice("a.jpg")
+            second = self.ocr_tool.process_invoice("b.jpg")
+
+        mock_extract.assert_called_once()
+        self.assertEqual(second["提取字段"], first["提取字段"])
+        self.assertIsNot(second["提取字段"], first["提取字段"])
+
+    def test_process_invoice_retries_ai_after_failure(self):
+        """测试处理发票 - AI解析失败时的回退结果不缓存"""
+        mock_ocr_result = {"data": [{"text": "发票号码：12345678"}]}
+        self.ocr_tool.use_ai = True
+        self.ocr_tool.ai_parser = Mock()
+        self.ocr_tool.ai_parser.extract_fields_with_ai.return_value = None
+
+        with patch.object(self.ocr_tool, 'recognize_image', return_value=mock_ocr_result):
+            self.ocr_tool.process_invoice("a.jpg")
+            self.ocr_tool.process_invoice("a.jpg")
+
+        self.assertEqual(self.ocr_tool.ai_parser.extract_fields_with_ai.call_count, 2)
+
+    def test_process_batch_pdfs(self):
+        """测试批量处理 - 多个PDF并发处理时在锁内渲染"""
+        import tempfile
+        from PIL import Image
+        import invoice_ocr_tool
+
+        render_pdf_page = self.ocr_tool._render_pdf_page
+        lock_held = []
+
+        def render_with_check(page):
+            lock_held.append(invoice_ocr_tool.PDFIUM_LOCK.locked())
+            return render_pdf_page(page)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pdf_paths = []
+            for index, color in enumerate(('white', 'gray', 'black')):
+                pdf_path = os.path.join(temp_dir, f"invoice_{index}.pdf")
+                pages = [Image.new('RGB', (200, 300), color) for _ in range(index + 1)]
+                pages[0].save(pdf_path, format='PDF', save_all=True, append_images=pages[1:])
+                pdf_paths.append(pdf_path)
+
+            self.ocr_tool.use_ai = False
+            with patch.object(self.ocr_tool, '_ocr_request',
+                              return_value={"code": 100, "data": [{"text": "发票号码：12345678"}]}) as mock_request, \
+                    patch.object(self.ocr_tool, '_render_pdf_page', side_effect=render_with_check):
+                results = self.ocr_tool.process_batch(pdf_paths, max_workers=3)
+
+        self.assertEqual([result["图片路径"] for result in results], pdf_paths)
+        self.assertTrue(all(result["提取字段"]["发票号码"] == "12345678" for result in results))
+        self.assertEqual(mock_request.call_count, 6)
+        self.assertEqual(lock_held, [True] * 6)
+        self.assertFalse(invoice_ocr_tool.PDFIUM_LOCK.locked())
+
 
 def run_manual_test():
     """手动测试函数"""